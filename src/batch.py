@@ -0,0 +1,67 @@
+from maple import *
+import glob, json, time, multiprocessing
+
+SCRIPT_SUFFIX = ".mpl"
+BATCH_CHUNK = 8 # scripts handed to a worker at once #
+
+# A batch is a directory (searched recursively), a single script, a manifest #
+# listing one script per line (relative to the manifest, `#` for comments)   #
+# or a glob pattern. Directories and globs are run and reported in sorted    #
+# order, manifests in their own order. A target without any script reports.  #
+def collect(target : str) -> list[str]:
+    if os.path.isdir(target):
+        paths = sorted(glob.glob(os.path.join(target, "**", "*" + SCRIPT_SUFFIX), recursive=True))
+    elif os.path.isfile(target):
+        if target.endswith(SCRIPT_SUFFIX):
+            return [target]
+        base = os.path.dirname(target)
+        with open(target, encoding="utf-8") as manifest:
+            lines = (line.strip() for line in manifest)
+            paths = [os.path.join(base, line) for line in lines if line and not line.startswith("#")]
+    else:
+        paths = sorted(glob.glob(target, recursive=True))
+    if not paths:
+        report("ArgumentException", f"No scripts found for the batch target `{target}`.")
+    return paths
+
+def run_file(path : str, engine : str = "tree", fold : bool = True, cache : bool = True, budget : Budget | None = None) -> list:
+    with open(path, "rb") as source:
+        script = source.read()
+    flags = "fold" if fold else "nofold"
+
+    ast = load_cached(path, script, flags) if cache else None
+    if not ast:
+        ast = parse(script, fold)
+        if cache:
+            store_cached(path, script, ast, flags)
+    return Program(ast, engine).run(budget)
+
+# Evaluates one script of a batch, recording its error instead of raising #
+def run_job(job : tuple) -> dict:
+    path, engine, fold, cache, budget = job
+    results = []
+    error = None
+
+    start = time.perf_counter()
+    try:
+        results = [represent(value) for value in run_file(path, engine, fold, cache, budget)]
+    except Exception as exception:
+        error = describe(exception)
+    elapsed = time.perf_counter() - start
+
+    return {"script" : path, "results" : results, "error" : error, "time" : round(elapsed, 6)}
+
+# Every script gets a budget of its own when one is given #
+def run_batch(paths : list[str], workers : int | None = None, engine : str = "tree", fold : bool = True, cache : bool = True, budget : Budget | None = None):
+    jobs = [(path, engine, fold, cache, budget) for path in paths]
+    if workers == 1 or len(jobs) < 2:
+        yield from map(run_job, jobs)
+        return
+
+    with multiprocessing.Pool(min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+        yield from pool.imap(run_job, jobs, chunksize=BATCH_CHUNK)
+
+def write_batch(records):
+    for record in records:
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
@@ -0,0 +1,152 @@
+from maple import *
+import argparse, json, platform, time, tracemalloc
+
+PHASES = ("lex", "parse", "run")
+
+# Synthetic scripts of about `size` statements or terms each #
+def arithmetic_chain(size : int) -> str:
+    return " + ".join(f"{i} * 3 - {i} / 2" for i in range(size)) + ";"
+
+def deep_parentheses(size : int) -> str:
+    return "(1 + " * size + "1" + ")" * size + ";"
+
+def array_literal(size : int) -> str:
+    return "{" + ", ".join(f"{i}.5" if i % 2 else f"{i}" for i in range(size)) + "};"
+
+def string_concatenation(size : int) -> str:
+    return " + ".join(f'"s{i}"' for i in range(size)) + ";"
+
+def factorial_tetration(size : int) -> str:
+    return " ".join(f"!{i % 200}; {i % 3 + 1} *** 3;" for i in range(size))
+
+def numeric_kernels(size : int) -> str:
+    return " ".join(f"!{300 + i % 700}; {i % 3 - 1} *** {1000 + i}; 0.5 *** 200; 2.0 ** {i % 1000};" for i in range(size))
+
+def tetration_towers(size : int) -> str:
+    return " ".join(f"{i % 9 + 2} *** {6 + i % 50} % {10 ** 9 + i}; {i % 4 + 2} *** {6 + i % 7} > 3 *** 5;" for i in range(size))
+
+def attribute_access(size : int) -> str:
+    return " ".join(f"{i}.5.ratio()[{i % 2}]; {i}.__class__;" for i in range(size))
+
+WORKLOADS = {
+    "arithmetic" : (arithmetic_chain, 20000),
+    "parentheses" : (deep_parentheses, 20000),
+    "array" : (array_literal, 50000),
+    "strings" : (string_concatenation, 5000),
+    "factorial" : (factorial_tetration, 2000),
+    "numeric" : (numeric_kernels, 1000),
+    "towers" : (tetration_towers, 200),
+    "attributes" : (attribute_access, 10000),
+}
+
+# Best of `repeat` timings of `function()`, with its last result #
+def timed(function, repeat : int) -> tuple[float, object]:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def peak_memory(function) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+# Times every phase of one script on its own, each fed by the previous #
+# phase's output, then measures each phase's peak memory in a separate #
+# untimed pass since tracing allocations slows everything down.         #
+def measure(source : str, repeat : int = 5, engine : str = "tree") -> dict:
+    size = len(source.encode())
+    lex = lambda: Lexer(source).tokenize()
+    seconds, tokens = timed(lex, repeat)
+    phases = {"lex" : (seconds, lex)}
+
+    parse = lambda: Parser(tokens).parse()
+    seconds, ast = timed(parse, repeat)
+    phases["parse"] = (seconds, parse)
+
+    code = prepare(freeze(ast), engine)
+    run = lambda: runner(engine, code).run()
+    seconds, _ = timed(run, repeat)
+    phases["run"] = (seconds, run)
+
+    measured = {"bytes" : size, "tokens" : len(tokens)}
+    for phase, (seconds, function) in phases.items():
+        measured[phase] = {
+            "seconds" : seconds,
+            "bytes_per_second" : size / seconds if seconds else None,
+            "peak_bytes" : peak_memory(function),
+        }
+    return measured
+
+def benchmark(names : Iterable[str], scale : float = 1.0, repeat : int = 5, engine : str = "tree") -> dict:
+    results = {}
+    for name in names:
+        generate, size = WORKLOADS[name]
+        results[name] = measure(generate(max(1, int(size * scale))), repeat, engine)
+    return {
+        "maple" : MAPLE_VERSION,
+        "python" : platform.python_version(),
+        "engine" : engine,
+        "scale" : scale,
+        "results" : results,
+    }
+
+# Rows of (workload, phase, baseline seconds, current seconds, ratio) for   #
+# every phase found in both reports; a ratio above 1 means slower than before. #
+def compare(baseline : dict, current : dict) -> list[tuple]:
+    rows = []
+    for name, phases in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for phase in PHASES:
+            if phase in before and phase in phases:
+                old, new = before[phase]["seconds"], phases[phase]["seconds"]
+                rows.append((name, phase, old, new, new / old if old else None))
+    return rows
+
+def write_report(summary : dict):
+    print(f"{'workload':<12} {'phase':<6} {'seconds':>10} {'MB/s':>9} {'peak KiB':>10}")
+    for name, result in summary["results"].items():
+        for phase in PHASES:
+            measured = result[phase]
+            throughput = measured["bytes_per_second"] or 0
+            print(f"{name:<12} {phase:<6} {measured['seconds']:>10.4f} {throughput / 1e6:>9.2f} {measured['peak_bytes'] / 1024:>10.0f}")
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(prog="maple-bench")
+    cli.add_argument("workloads", nargs="*", help=f"workloads to run, among {', '.join(WORKLOADS)} (default: all)")
+    cli.add_argument("--scale", type=float, default=1.0, help="multiplier applied to every workload's size")
+    cli.add_argument("--repeat", type=int, default=5, help="timed runs of each phase, the best one is kept")
+    cli.add_argument("--engine", choices=ENGINES, default="tree", help="engine timed in the run phase")
+    cli.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    cli.add_argument("--compare", metavar="PATH", help="compare the results with a JSON baseline")
+    cli.add_argument("--tolerance", type=float, default=0.1, help="slowdown over the baseline reported as a regression")
+    args = cli.parse_args()
+    unknown = [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        cli.error(f"unknown workload: {', '.join(unknown)}")
+
+    summary = benchmark(args.workloads or WORKLOADS, args.scale, args.repeat, args.engine)
+    write_report(summary)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as baseline:
+            json.dump(summary, baseline, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline:
+            rows = compare(json.load(baseline), summary)
+        regressed = False
+        print(f"\n{'workload':<12} {'phase':<6} {'baseline':>10} {'current':>10} {'ratio':>7}")
+        for name, phase, old, new, ratio in rows:
+            slower = ratio is not None and ratio > 1 + args.tolerance
+            regressed = regressed or slower
+            print(f"{name:<12} {phase:<6} {old:>10.4f} {new:>10.4f} {ratio or 0:>7.2f}{'  slower' if slower else ''}")
+        sys.exit(1 if regressed else 0)
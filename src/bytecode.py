@@ -0,0 +1,210 @@
+from static import *
+from array import array
+
+OP_CONST    = 0 # push constants[arg]
+OP_BINARY   = 1 # pop right, replace left with the result of OPERATIONS[arg]
+OP_NOT      = 2
+OP_ABS      = 3
+OP_GETATTR  = 4 # arg indexes names
+OP_SETATTR  = 5 # arg indexes names
+OP_GETINDEX = 6
+OP_INVOKE   = 7 # arg is the number of arguments
+OP_ARRAY    = 8 # arg is the number of elements
+OP_RESULT   = 9 # pop the statement's result
+
+OPERATIONS = tuple(BINARY_OPERATIONS.values())
+OPCODES = {_type : OPERATIONS.index(operation) for _type, operation in BINARY_OPERATIONS.items()}
+
+class Bytecode:
+    def __init__(self, code : array, constants : tuple, names : tuple, positions : tuple = (), sizes : tuple = ()):
+        self.code = code
+        self.constants = constants
+        self.names = names
+        self.positions = positions # source offset of every statement, by result index #
+        self.sizes = sizes         # instructions of every statement before its OP_RESULT, by result index #
+
+    def __repr__(self) -> str:
+        return f"<bytecode {len(self.code) // 2} instructions, {len(self.constants)} constants>"
+
+class Compiler:
+    def __init__(self):
+        self.code = array("i")
+        self.constants : list[MapleType] = []
+        self.names : list[str] = []
+        self.positions : list[int | None] = []
+        self.sizes : list[int] = []
+        self.indexes : dict = {}
+
+    def compile(self, ast : Node) -> Bytecode:
+        self.code = array("i")
+        self.constants = []
+        self.names = []
+        self.positions = []
+        self.sizes = []
+        self.indexes = {}
+
+        if isinstance(ast, ScriptNode):
+            self.visit(ast)
+        else:
+            self.result(ast)
+
+        return Bytecode(self.code, tuple(self.constants), tuple(self.names), tuple(self.positions), tuple(self.sizes))
+
+    def result(self, statement : Node):
+        start = len(self.code)
+        self.visit(statement)
+        self.positions.append(statement.position)
+        self.sizes.append((len(self.code) - start) // 2)
+        self.emit(OP_RESULT)
+
+    def emit(self, op : int, arg : int = 0):
+        self.code.append(op)
+        self.code.append(arg)
+
+    def constant(self, value : MapleType) -> int:
+        key = ("constant",) + constant_key(value)
+        if key not in self.indexes:
+            self.indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return self.indexes[key]
+
+    def name(self, name : str) -> int:
+        key = ("name", name)
+        if key not in self.indexes:
+            self.indexes[key] = len(self.names)
+            self.names.append(name)
+        return self.indexes[key]
+
+    # Children are emitted before their parent, so the tree can be walked with #
+    # postvisit: every visit method then finds its operands already emitted.  #
+    def visit(self, node : Node):
+        if isinstance(node, ScriptNode):
+            return self.visit_ScriptNode(node)
+        return postvisit(self, node, self.visit_error)
+
+    def visit_error(self, node : Node):
+        report("DeveloperFailureException", f"No compile method defined for `{type(node).__name__}`-type node.")
+
+    def visit_ScriptNode(self, node : ScriptNode):
+        for statement in node.statements:
+            self.result(statement)
+
+    def visit_NumberNode(self, node : NumberNode):
+        self.emit(OP_CONST, self.constant(literal(node)))
+
+    def visit_StringNode(self, node : StringNode):
+        self.emit(OP_CONST, self.constant(literal(node)))
+
+    def visit_BooleanNode(self, node : BooleanNode):
+        self.emit(OP_CONST, self.constant(literal(node)))
+
+    def visit_ArrayNode(self, node : ArrayNode):
+        for e in node.elements:
+            self.visit(e)
+        self.emit(OP_ARRAY, len(node.elements))
+
+    def visit_BinOpNode(self, node : BinOpNode):
+        if node.op.type not in OPCODES:
+            report("DeveloperFailureException", f"No binary operation defined for `{node.op.type}`.")
+        self.visit(node.left)
+        self.visit(node.right)
+        self.emit(OP_BINARY, OPCODES[node.op.type])
+
+    def visit_NegationNode(self, node : NegationNode):
+        self.visit(node.node)
+        self.emit(OP_NOT)
+
+    def visit_AbsoluteNode(self, node : AbsoluteNode):
+        self.visit(node.node)
+        self.emit(OP_ABS)
+
+    def visit_GetAttributeNode(self, node : GetAttributeNode):
+        self.visit(node.node)
+        self.emit(OP_GETATTR, self.name(node.attribute))
+
+    def visit_SetAttributeNode(self, node : SetAttributeNode):
+        self.visit(node.node)
+        self.visit(node.value)
+        self.emit(OP_SETATTR, self.name(node.attribute))
+
+    def visit_GetIndexNode(self, node : GetIndexNode):
+        self.visit(node.node)
+        self.visit(node.index)
+        self.emit(OP_GETINDEX)
+
+    def visit_InvokeNode(self, node : InvokeNode):
+        self.visit(node.node)
+        for arg in node.args:
+            self.visit(arg)
+        self.emit(OP_INVOKE, len(node.args))
+
+class VM:
+    def __init__(self, bytecode : Bytecode | None = None):
+        self.bytecode = bytecode
+
+    def run(self):
+        return self.evaluate(self.bytecode)
+
+    def execute(self, statements : Iterable[Node]):
+        compiler = Compiler()
+        for statement in statements:
+            yield self.evaluate(compiler.compile(statement))[0]
+
+    def evaluate(self, bytecode : Bytecode) -> list:
+        constants = bytecode.constants
+        names = bytecode.names
+        operations = OPERATIONS
+        kernels = KERNELS
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        results = []
+
+        # Every statement is charged to the run's budget, if any, before it runs #
+        meter = BUDGET_METER.get()
+        sizes = bytecode.sizes
+
+        instructions = iter(bytecode.code)
+        try:
+            if meter is not None and sizes:
+                meter.charge(sizes[0])
+            for op, arg in zip(instructions, instructions):
+                if op == OP_CONST:
+                    push(constants[arg])
+                elif op == OP_BINARY:
+                    right = pop()
+                    left = stack[-1]
+                    kernel = kernels.get((operations[arg], type(left), type(right)))
+                    stack[-1] = kernel(left, right) if kernel else getattr(left, operations[arg])(right)
+                elif op == OP_RESULT:
+                    results.append(pop())
+                    if meter is not None and len(results) < len(sizes):
+                        meter.charge(sizes[len(results)])
+                elif op == OP_NOT:
+                    stack[-1] = stack[-1].op_compare_not()
+                elif op == OP_ABS:
+                    stack[-1] = stack[-1].op_abs()
+                elif op == OP_GETATTR:
+                    stack[-1] = stack[-1].op_getattr(names[arg])
+                elif op == OP_GETINDEX:
+                    index = pop()
+                    stack[-1] = stack[-1].op_getindex(index)
+                elif op == OP_INVOKE:
+                    args = stack[len(stack) - arg:]
+                    del stack[len(stack) - arg:]
+                    stack[-1] = stack[-1].op_invoke(args)
+                elif op == OP_ARRAY:
+                    elements = stack[len(stack) - arg:]
+                    del stack[len(stack) - arg:]
+                    push(MapleARRAY.of(elements))
+                elif op == OP_SETATTR:
+                    value = pop()
+                    pop().op_setattr(names[arg], value)
+                    push(None)
+                else:
+                    report("DeveloperFailureException", f"Unknown opcode `{op}`.")
+        except (MapleError, ArithmeticError) as error:
+            positions = bytecode.positions
+            raise located(error, positions[len(results)] if len(results) < len(positions) else None)
+
+        return results
@@ -0,0 +1,145 @@
+from static import *
+from collections import OrderedDict
+from array import array
+import hashlib, pickle, stat, threading, types
+
+# Entries are unpickled, so they're only kept in a directory private to the #
+# user running the interpreter, never next to the scripts themselves.       #
+if os.name == "nt":
+    CACHE_DIRECTORY = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "maple", "cache")
+else:
+    CACHE_DIRECTORY = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "maple")
+CACHE_MAGIC = b"MPLC"
+CACHE_FORMAT = 2 # bumped whenever pickled nodes or tokens change layout #
+CACHE_VERSION = f"{MAPLE_VERSION}.{CACHE_FORMAT}-py{sys.version_info[0]}.{sys.version_info[1]}"
+
+# Runs of one script with different flags get entries of their own #
+def cache_path(path : str, flags : str = "") -> str:
+    name = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(CACHE_DIRECTORY, f"{name}-{flags}.mplc" if flags else f"{name}.mplc")
+
+# Whether a cache directory or entry can only have been written by this user #
+def private(info : os.stat_result) -> bool:
+    if os.name == "nt":
+        return True # the per-user application data directory isn't shared #
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+def private_directory(directory : str) -> bool:
+    try:
+        info = os.lstat(directory)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and private(info)
+
+def cache_header(source, flags : str) -> bytes:
+    digest = hashlib.sha256(source).hexdigest()
+    return b" ".join([CACHE_MAGIC, CACHE_VERSION.encode(), digest.encode(), flags.encode()]) + b"\n"
+
+# Returns the cached AST of `source`, or None on a miss or an unusable entry #
+def load_cached(path : str, source, flags : str = "") -> ScriptNode | None:
+    if not private_directory(CACHE_DIRECTORY):
+        return None
+    try:
+        with open(cache_path(path, flags), "rb") as entry:
+            info = os.fstat(entry.fileno())
+            if not stat.S_ISREG(info.st_mode) or not private(info):
+                return None
+            if entry.readline() != cache_header(source, flags):
+                return None
+            ast = pickle.load(entry)
+    except Exception:
+        return None
+    return ast if isinstance(ast, ScriptNode) else None
+
+def store_cached(path : str, source, ast : ScriptNode, flags : str = ""):
+    target = cache_path(path, flags)
+    temporary = f"{target}.{os.getpid()}.tmp"
+    try:
+        payload = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+        os.makedirs(CACHE_DIRECTORY, 0o700, exist_ok=True)
+        if not private_directory(CACHE_DIRECTORY):
+            return
+        with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600), "wb") as entry:
+            entry.write(cache_header(source, flags))
+            entry.write(payload)
+        os.replace(temporary, target)
+    except (OSError, pickle.PicklingError, RecursionError):
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+# Rough memory footprint of an object graph, for the parse cache's byte budget #
+def footprint(root) -> int:
+    total = 0
+    seen = set()
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif not isinstance(obj, (str, bytes, int, float, bool, array, types.CodeType)) and obj is not None:
+            if hasattr(obj, "__dict__"):
+                stack.extend(vars(obj).values())
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    stack.append(getattr(obj, slot, None))
+    return total
+
+class ParseCache:
+    def __init__(self, budget : int = 64 * 1024 * 1024):
+        self.budget = budget
+        self.entries : OrderedDict = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<parse cache {len(self.entries)} entries, {self.size}/{self.budget} bytes>"
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, program, size : int):
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            if size > self.budget:
+                return
+            self.entries[key] = (program, size)
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def info(self) -> dict:
+        with self.lock:
+            return {
+                "entries"   : len(self.entries),
+                "size"      : self.size,
+                "budget"    : self.budget,
+                "hits"      : self.hits,
+                "misses"    : self.misses,
+                "evictions" : self.evictions,
+            }
@@ -0,0 +1,64 @@
+import sys, json, socket, struct, argparse
+
+# Messages between `lang.py --serve` and its clients are UTF-8 JSON documents #
+# prefixed with their length as a 4-byte big-endian unsigned integer.        #
+HEADER = struct.Struct(">I")
+MAX_MESSAGE = 64 * 1024 * 1024
+
+def send_message(stream, message : dict):
+    payload = json.dumps(message).encode()
+    stream.sendall(HEADER.pack(len(payload)) + payload)
+
+def receive_exactly(stream, size : int) -> bytes | None:
+    chunks = []
+    while size:
+        chunk = stream.recv(min(size, 1 << 16))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+# Returns None once the other side closed the connection #
+def receive_message(stream) -> dict | None:
+    header = receive_exactly(stream, HEADER.size)
+    if header is None:
+        return None
+    size, = HEADER.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ValueError(f"Message of {size} bytes exceeds the {MAX_MESSAGE} bytes limit.")
+    payload = receive_exactly(stream, size)
+    if payload is None:
+        return None
+    return json.loads(payload)
+
+def request(path : str, source : str, engine : str = "tree", fold : bool = True) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        send_message(connection, {"source" : source, "engine" : engine, "fold" : fold})
+        response = receive_message(connection)
+    if response is None:
+        raise ConnectionError("The server closed the connection without answering.")
+    return response
+
+# Kept free of interpreter imports so it starts as fast as Python itself #
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(prog="maple-client")
+    cli.add_argument("socket", help="socket of a running `lang.py --serve` process")
+    cli.add_argument("path", nargs="?", default="-", help="MAPLe script to run, `-` (default) for standard input")
+    cli.add_argument("--engine", default="tree", help="execution engine used by the server")
+    cli.add_argument("--no-fold", action="store_true", help="don't fold constant subexpressions before running")
+    args = cli.parse_args()
+
+    if args.path == "-":
+        source = sys.stdin.read()
+    else:
+        with open(args.path, encoding="utf-8") as script:
+            source = script.read()
+
+    response = request(args.socket, source, args.engine, not args.no_fold)
+    for value in response["results"]:
+        sys.stdout.write(value + "\n")
+    if response["error"]:
+        print(f"Fatal exception reported:\n {response['error']['kind']} : {response['error']['message']}")
+        sys.exit(-1)
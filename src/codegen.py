@@ -0,0 +1,184 @@
+from static import *
+
+NUMERIC = (MapleINT, MapleFLOAT)
+
+# Temporaries deeper than this live in a dict rather than in locals: #
+# CPython compiles functions with very many locals slowly.           #
+TEMPORARY_LOCALS = 256
+
+class PythonProgram:
+    def __init__(self, source : str, constants : tuple, kernels : tuple, positions : tuple = ()):
+        self.source = source
+        self.constants = constants
+        self.kernels = kernels
+        self.positions = positions # source offset of every statement, by result index #
+        self.code = compile(source, "<maple>", "exec")
+
+        namespace = {f"_k{i}" : value for i, value in enumerate(constants)}
+        namespace.update({f"_f{i}" : kernel for i, kernel in enumerate(kernels)})
+        namespace.update(dispatch=dispatch, MapleARRAY=MapleARRAY)
+        exec(self.code, namespace)
+        self.function = namespace["__maple__"]
+
+    def __repr__(self) -> str:
+        return f"<python program {len(self.constants)} constants>"
+
+    def run(self) -> list:
+        results = []
+        try:
+            self.function(results, BUDGET_METER.get())
+        except (MapleError, ArithmeticError) as error:
+            positions = self.positions
+            raise located(error, positions[len(results)] if len(results) < len(positions) else None)
+        return results
+
+class Translator:
+    def __init__(self):
+        self.lines : list[str] = []
+        self.constants : list[MapleType] = []
+        self.kernels : list = []
+        self.positions : list[int | None] = []
+        self.indexes : dict = {}
+        self.spilled = False
+
+    def translate(self, ast : Node) -> PythonProgram:
+        self.lines = ["def __maple__(_r, _m):"]
+        self.constants = []
+        self.kernels = []
+        self.positions = []
+        self.indexes = {}
+        self.spilled = False
+
+        if isinstance(ast, ScriptNode):
+            self.visit(ast, 0)
+        else:
+            self.result(ast)
+        self.emit("pass")
+        if self.spilled:
+            self.lines.insert(1, "    _t = {}")
+
+        return PythonProgram("\n".join(self.lines) + "\n", tuple(self.constants), tuple(self.kernels), tuple(self.positions))
+
+    def emit(self, line : str):
+        self.lines.append("    " + line)
+
+    # Every statement is charged to the run's budget meter `_m`, if any, first #
+    def result(self, statement : Node):
+        self.positions.append(statement.position)
+        self.emit(f"if _m is not None: _m.charge({tree_size(statement)})")
+        operand, _ = self.visit(statement, 0)
+        self.emit(f"_r.append({operand})")
+
+    def slot(self, depth : int) -> str:
+        if depth < TEMPORARY_LOCALS:
+            return f"_s{depth}"
+        self.spilled = True
+        return f"_t[{depth}]"
+
+    def constant(self, value : MapleType) -> str:
+        key = constant_key(value)
+        if key not in self.indexes:
+            self.indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return f"_k{self.indexes[key]}"
+
+    def kernel(self, kernel) -> str:
+        key = ("kernel", kernel)
+        if key not in self.indexes:
+            self.indexes[key] = len(self.kernels)
+            self.kernels.append(kernel)
+        return f"_f{self.indexes[key]}"
+
+    # Every visit returns the operand holding the node's value together with #
+    # its static type, or None when the type is only known at runtime.       #
+    # Nodes are translated children first with postvisit, whose evaluation #
+    # stack slots are the depths of the temporaries holding their values.  #
+    def visit(self, node : Node, depth : int) -> tuple[str, type | None]:
+        if isinstance(node, ScriptNode):
+            return self.visit_ScriptNode(node, depth)
+        return postvisit(self, node, self.visit_error, depth)
+
+    def visit_error(self, node : Node, depth : int):
+        report("DeveloperFailureException", f"No translate method defined for `{type(node).__name__}`-type node.")
+
+    def visit_ScriptNode(self, node : ScriptNode, depth : int):
+        for statement in node.statements:
+            self.result(statement)
+        return "_r", None
+
+    def visit_NumberNode(self, node : NumberNode, depth : int):
+        value = literal(node)
+        return self.constant(value), type(value)
+
+    def visit_StringNode(self, node : StringNode, depth : int):
+        return self.constant(literal(node)), MapleSTRING
+
+    def visit_BooleanNode(self, node : BooleanNode, depth : int):
+        return self.constant(literal(node)), MapleBOOLEAN
+
+    def visit_ArrayNode(self, node : ArrayNode, depth : int):
+        elements = [self.visit(e, depth + i)[0] for i, e in enumerate(node.elements)]
+        self.emit(f"{self.slot(depth)} = MapleARRAY.of([{', '.join(elements)}])")
+        return self.slot(depth), MapleARRAY
+
+    def visit_BinOpNode(self, node : BinOpNode, depth : int):
+        operation = BINARY_OPERATIONS.get(node.op.type)
+        if not operation:
+            report("DeveloperFailureException", f"No binary operation defined for `{node.op.type}`.")
+        left, left_type = self.visit(node.left, depth)
+        right, right_type = self.visit(node.right, depth + 1)
+
+        # Operand types known here let the kernel be called without dispatching #
+        kernel = KERNELS.get((operation, left_type, right_type))
+        if kernel:
+            self.emit(f"{self.slot(depth)} = {self.kernel(kernel)}({left}, {right})")
+            return self.slot(depth), RESULTS[(operation, left_type, right_type)]
+
+        self.emit(f"{self.slot(depth)} = dispatch({operation!r}, {left}, {right})")
+        return self.slot(depth), None
+
+    def visit_NegationNode(self, node : NegationNode, depth : int):
+        subscript, _ = self.visit(node.node, depth)
+        self.emit(f"{self.slot(depth)} = {subscript}.op_compare_not()")
+        return self.slot(depth), None
+
+    def visit_AbsoluteNode(self, node : AbsoluteNode, depth : int):
+        subscript, subscript_type = self.visit(node.node, depth)
+        self.emit(f"{self.slot(depth)} = {subscript}.op_abs()")
+        return self.slot(depth), subscript_type if subscript_type in NUMERIC else None
+
+    def visit_GetAttributeNode(self, node : GetAttributeNode, depth : int):
+        parent, _ = self.visit(node.node, depth)
+        self.emit(f"{self.slot(depth)} = {parent}.op_getattr({node.attribute!r})")
+        return self.slot(depth), None
+
+    def visit_SetAttributeNode(self, node : SetAttributeNode, depth : int):
+        parent, _ = self.visit(node.node, depth)
+        value, _ = self.visit(node.value, depth + 1)
+        self.emit(f"{parent}.op_setattr({node.attribute!r}, {value})")
+        self.emit(f"{self.slot(depth)} = None")
+        return self.slot(depth), None
+
+    def visit_GetIndexNode(self, node : GetIndexNode, depth : int):
+        parent, _ = self.visit(node.node, depth)
+        index, _ = self.visit(node.index, depth + 1)
+        self.emit(f"{self.slot(depth)} = {parent}.op_getindex({index})")
+        return self.slot(depth), None
+
+    def visit_InvokeNode(self, node : InvokeNode, depth : int):
+        parent, _ = self.visit(node.node, depth)
+        args = [self.visit(arg, depth + 1 + i)[0] for i, arg in enumerate(node.args)]
+        self.emit(f"{self.slot(depth)} = {parent}.op_invoke([{', '.join(args)}])")
+        return self.slot(depth), None
+
+class PythonEngine:
+    def __init__(self, program : PythonProgram | None = None):
+        self.program = program
+
+    def run(self):
+        return self.program.run()
+
+    def execute(self, statements : Iterable[Node]):
+        translator = Translator()
+        for statement in statements:
+            yield translator.translate(statement).run()[0]
@@ -1,4 +1,8 @@
-from static import *
+from batch import *
+from parallel import *
+from server import *
+from profiler import *
+from stats import *
 
 # if __name__ == "__main__":
 #     while True:
@@ -15,20 +19,116 @@ from static import *
 #         ret = inter.run()
 #         print(ret)
 
-import sys
+import sys, mmap, argparse, time
 
-if len(sys.argv) > 1:
-    path = sys.argv[1]
+STREAM_CHUNK = 256      # results written between two flushes #
+STREAM_INTERVAL = 0.05  # seconds before pending results are flushed anyway #
 
-    with open(path, "r") as source:
-        script = source.read()
-        source.close()
+def load(source):
+    if os.fstat(source.fileno()).st_size:
+        return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    return b""
 
-    lexer = Lexer(script)
-    tokens = lexer.tokenize()
-    parser = Parser(tokens)
-    ast = parser.parse()
-    inter = Interpreter(ast)
-    returned = inter.run()
+def write_stream(results):
+    pending = 0
+    flushed = None
+    for value in results:
+        sys.stdout.write(represent(value) + "\n")
+        pending += 1
+        now = time.perf_counter()
+        if flushed is None or pending >= STREAM_CHUNK or now - flushed >= STREAM_INTERVAL:
+            sys.stdout.flush()
+            pending = 0
+            flushed = now
+    sys.stdout.flush()
 
-    print(returned)
\ No newline at end of file
+cli = argparse.ArgumentParser(prog="maple")
+cli.add_argument("path", nargs="?", help="MAPLe script to run")
+cli.add_argument("--stream", action="store_true", help="run statement by statement, printing every result as soon as it's evaluated")
+cli.add_argument("--engine", choices=ENGINES, default="tree", help="execution engine: the AST walker, the bytecode VM or generated Python code")
+cli.add_argument("--no-fold", action="store_true", help="don't fold constant subexpressions before running")
+cli.add_argument("--no-cache", action="store_true", help=f"don't read or write parsed scripts in {CACHE_DIRECTORY}")
+cli.add_argument("--batch", metavar="TARGET", help="run every script of a directory, manifest or glob, printing one JSON line per script")
+cli.add_argument("--parallel", action="store_true", help="spread independent statements over a pool of worker processes")
+cli.add_argument("--serve", metavar="SOCKET", help="keep a warm interpreter answering scripts sent by client.py over a Unix socket")
+cli.add_argument("--profile", action="store_true", help="time every phase, node type and statement, printing a report to stderr")
+cli.add_argument("--profile-json", metavar="PATH", help="like --profile, but write the report to PATH as JSON")
+cli.add_argument("--stats", action="store_true", help="count the Maple objects created while running, printing them to stderr")
+cli.add_argument("--max-steps", type=int, metavar="N", help="fail once a run evaluated more than N nodes")
+cli.add_argument("--max-seconds", type=float, metavar="S", help="fail once a run took more than S seconds")
+cli.add_argument("--max-bits", type=int, metavar="N", help="fail before computing an integer of more than N bits")
+cli.add_argument("--max-memory", type=int, metavar="BYTES", help="fail once a run produced more than BYTES of large integers and strings and of arrays")
+cli.add_argument("--workers", type=int, default=None, help="worker processes for --batch and --parallel (default: one per CPU)")
+
+def run_budget(args) -> Budget | None:
+    limits = (args.max_steps, args.max_seconds, args.max_bits, args.max_memory)
+    if all(limit is None for limit in limits):
+        return None
+    return Budget(*limits)
+
+def run(args):
+    budget = run_budget(args)
+    with open(args.path, "rb") as source:
+        script = load(source)
+        flags = "nofold" if args.no_fold else "fold"
+
+        if args.profile or args.profile_json:
+            profile = Profile(script)
+            try:
+                with limited(budget):
+                    print(run_profiled(script, profile, args.engine, not args.no_fold))
+            finally:
+                write_profile(profile, args.profile_json)
+            return
+
+        if args.stream:
+            statements = Parser(Lexer(script).stream()).statements()
+            if not args.no_fold:
+                statements = map(Folder().fold, statements)
+            with limited(budget):
+                write_stream(runner(args.engine).execute(statements))
+        else:
+            ast = None if args.no_cache else load_cached(args.path, script, flags)
+            if not ast:
+                ast = parse(script, not args.no_fold)
+                if not args.no_cache:
+                    store_cached(args.path, script, ast, flags)
+
+    if args.parallel and not args.stream:
+        returned = ParallelExecutor(args.workers, args.engine, budget).run(ast)
+        print(returned)
+    elif not args.stream:
+        returned = Program(ast, args.engine).run(budget)
+
+        print(returned)
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    if args.serve:
+        try:
+            serve(args.serve, run_budget(args))
+        except MapleError as error:
+            print(error.report())
+            sys.exit(-1)
+    elif args.batch:
+        try:
+            paths = collect(args.batch)
+        except MapleError as error:
+            print(error.report())
+            sys.exit(-1)
+        write_batch(run_batch(paths, args.workers, args.engine, not args.no_fold, not args.no_cache, run_budget(args)))
+    elif args.path:
+        stats = AllocationStats() if args.stats else None
+        try:
+            if stats is not None:
+                with track_allocations(stats):
+                    run(args)
+            else:
+                run(args)
+        except MapleError as error:
+            sys.stdout.flush()
+            print(error.report())
+            sys.exit(-1)
+        finally:
+            if stats is not None:
+                write_stats(stats)
@@ -0,0 +1,66 @@
+from maple import *
+import argparse, random, time
+
+# Fragments random sources are glued from, covering every token kind, #
+# the number/dot splits and the broken inputs both engines must reject #
+LEXCHECK_FRAGMENTS = (
+    "1", "42", "-7", "0", "1.5", "-2.25", "3.", ".", "..", "1.2.3", "7.a",
+    "+", "-", "*", "**", "***", "/", "%", "|", "||", "&", "&&",
+    "!", "!=", "=", "==", ">", ">=", "<", "<=",
+    "(", ")", "{", "}", "[", "]", ";", ",",
+    "x", "abc", "_name", "if", "log", "true", "false",
+    "'text'", "\"text\"", "''", "'open", "\"open",
+    " ", "  ", "\t", "\r\n", "\n", "@", "#",
+)
+
+# Tokens, or the failure, of one engine as comparable plain values #
+def lexed(source : str | bytes, engine : str):
+    try:
+        return [(token.type, token.value, token.position) for token in Lexer(source, engine).stream()]
+    except MapleError as error:
+        return (type(error).__name__, error.kind, error.message, error.position)
+
+# Lexes random sources with the regex engine, as str and as bytes, and with #
+# the scan engine, and checks all three agree on every token and error. #
+# Returns the mismatching sources. #
+def lexcheck(runs : int = 10000, fragments : int = 12, seed : int | None = None) -> list[str]:
+    generator = random.Random(seed)
+    mismatches = []
+    for _ in range(runs):
+        source = "".join(generator.choice(LEXCHECK_FRAGMENTS) for _ in range(generator.randint(1, fragments)))
+        expected = lexed(source, "regex")
+        if lexed(source.encode(), "regex") != expected or lexed(source, "scan") != expected:
+            mismatches.append(source)
+    return mismatches
+
+# Seconds each engine takes to lex `source` #
+def timed(source : str) -> dict[str, float]:
+    elapsed = {}
+    for engine in LEXER_ENGINES:
+        start = time.perf_counter()
+        for _ in Lexer(source, engine).stream():
+            pass
+        elapsed[engine] = time.perf_counter() - start
+    return elapsed
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(prog="maple-lexcheck")
+    cli.add_argument("--runs", type=int, default=10000, help="random sources to compare the engines on")
+    cli.add_argument("--fragments", type=int, default=12, help="most fragments glued into one source")
+    cli.add_argument("--seed", type=int, default=None, help="seed for the random sources")
+    cli.add_argument("--time", metavar="PATH", help="also time both engines on the MAPLe script at PATH")
+    args = cli.parse_args()
+
+    start = time.perf_counter()
+    mismatches = lexcheck(args.runs, args.fragments, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{args.runs} sources in {elapsed:.3f}s, {len(mismatches)} mismatches")
+    for source in mismatches[:10]:
+        print(f"  {source!r}")
+
+    if args.time:
+        with open(args.time, encoding="utf-8") as script:
+            source = script.read()
+        for engine, seconds in timed(source).items():
+            print(f"{engine:<8} {seconds:.3f}s")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,118 @@
+from bytecode import *
+from codegen import *
+from optimizer import *
+from cache import *
+
+ENGINES = ("tree", "vm", "python")
+
+PARSE_CACHE = ParseCache()
+
+# A `folder` may be passed to read how many nodes folding eliminated #
+def parse(source : str | bytes, fold : bool = True, folder : Folder | None = None) -> ScriptNode:
+    ast = Parser(Lexer(source).stream()).parse()
+    if fold:
+        ast = (folder if folder is not None else Folder()).fold(ast)
+    return ast
+
+def prepare(ast : ScriptNode, engine : str = "tree"):
+    if engine == "vm":
+        return Compiler().compile(ast)
+    if engine == "python":
+        return Translator().translate(ast)
+    return ast
+
+def runner(engine : str = "tree", program = None):
+    if engine == "vm":
+        return VM(program)
+    if engine == "python":
+        return PythonEngine(program)
+    return Interpreter(program)
+
+# Resolves every literal's constant up front, so running the AST never writes to it #
+def freeze(ast : Node) -> Node:
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (NumberNode, StringNode)):
+            literal(node)
+        stack.extend(node.children())
+    return ast
+
+# A script prepared for one engine. Programs are never modified once built, #
+# so a single one can be run from any number of threads at once: all of a   #
+# run's state lives in the runner created for it.                           #
+class Program:
+    __slots__ = ("engine", "code")
+
+    def __init__(self, ast : ScriptNode, engine : str = "tree"):
+        if engine not in ENGINES:
+            report("DeveloperFailureException", f"Unknown engine: `{engine}`.")
+        object.__setattr__(self, "engine", engine)
+        object.__setattr__(self, "code", prepare(freeze(ast), engine))
+
+    def __setattr__(self, name : str, value):
+        raise AttributeError("Program objects are immutable.")
+
+    def __delattr__(self, name : str):
+        raise AttributeError("Program objects are immutable.")
+
+    def __repr__(self) -> str:
+        return f"<{self.engine} program>"
+
+    # With a budget, the run fails with a MapleBudgetError once it runs out #
+    def run(self, budget : Budget | None = None) -> list:
+        with limited(budget):
+            return runner(self.engine, self.code).run()
+
+    async def run_async(self, steps : int = ASYNC_STEPS, timeout : float | None = None, budget : Budget | None = None) -> list:
+        if self.engine != "tree":
+            report("DeveloperFailureException", f"Only tree programs can run asynchronously, not `{self.engine}` ones.")
+        with limited(budget):
+            return await Interpreter(self.code).run_async(steps, timeout)
+
+# Program for `source`, shared through `cache` when one is given #
+def compile_program(source : str, engine : str = "tree", fold : bool = True, cache : ParseCache | None = PARSE_CACHE) -> Program:
+    key = (source, engine, fold)
+    program = cache.get(key) if cache is not None else None
+    if program is None:
+        program = Program(parse(source, fold), engine)
+        if cache is not None:
+            cache.put(key, program, sys.getsizeof(source) + footprint(program))
+    return program
+
+def evaluate(source : str, engine : str = "tree", fold : bool = True, cache : ParseCache | None = PARSE_CACHE, budget : Budget | None = None) -> list:
+    return compile_program(source, engine, fold, cache).run(budget)
+
+# Coroutine counterpart of compile_program() for the tree engine. Sources #
+# missing from the cache are parsed, folded and frozen in a worker thread, #
+# so the event loop keeps running however long one statement takes. Once  #
+# started, that work isn't cancelled with the coroutine: it still finishes #
+# and fills the cache.                                                     #
+async def compile_program_async(source : str, fold : bool = True, cache : ParseCache | None = PARSE_CACHE) -> Program:
+    key = (source, "tree", fold)
+    program = cache.get(key) if cache is not None else None
+    if program is None:
+        def compiled() -> Program:
+            program = Program(parse(source, fold), "tree")
+            if cache is not None:
+                cache.put(key, program, sys.getsizeof(source) + footprint(program))
+            return program
+        program = await asyncio.to_thread(compiled)
+    return program
+
+# Coroutine counterpart of evaluate() for event loops, always on the tree #
+# engine. The timeout covers parsing the source as well as running it.    #
+async def evaluate_async(source : str, fold : bool = True, steps : int = ASYNC_STEPS, timeout : float | None = None, cache : ParseCache | None = PARSE_CACHE, budget : Budget | None = None) -> list:
+    async def evaluation():
+        program = await compile_program_async(source, fold, cache)
+        return await program.run_async(steps, None, budget)
+
+    if timeout is not None:
+        return await asyncio.wait_for(evaluation(), timeout)
+    return await evaluation()
+
+# JSON-friendly description of an error raised while running a script #
+def describe(error : Exception) -> dict:
+    if isinstance(error, MapleError):
+        return {"kind" : error.kind, "message" : error.message, "position" : error.position}
+    return {"kind" : type(error).__name__, "message" : f"{error}", "position" : None}
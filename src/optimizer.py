@@ -0,0 +1,217 @@
+from static import *
+
+FOLD_BITS = 4096 # biggest INT, in bits, the folder is allowed to produce #
+
+NUMERIC = (MapleINT, MapleFLOAT)
+
+# Only operand pairs with a registered kernel are folded: those are known #
+# to be accepted without reporting.                                       #
+def foldable(_type : str, left : MapleType, right : MapleType) -> bool:
+    if (BINARY_OPERATIONS[_type], type(left), type(right)) not in KERNELS:
+        return False
+
+    if _type in (TT_DIV, TT_MOD):
+        return right.value != 0
+    if _type == TT_POW:
+        return fits_power(left.value, right.value)
+    if _type == TT_TETR:
+        if right.value > FOLD_BITS:
+            return False
+        try:
+            result = 1
+            for _ in range(right.value):
+                if not isinstance(result, (int, float)) or not fits_power(left.value, result):
+                    return False
+                result = left.value ** result
+        except ArithmeticError:
+            return False
+    return True
+
+def fits_power(base, exponent) -> bool:
+    if isinstance(base, float) or isinstance(exponent, float) or exponent <= 0 or base in (0, 1, -1):
+        return True
+    return base.bit_length() * exponent <= FOLD_BITS
+
+def fits_factorial(n) -> bool:
+    return type(n) is int and (n < 2 or n * n.bit_length() <= FOLD_BITS)
+
+LITERALS = (NumberNode, StringNode, BooleanNode)
+
+def is_literal(node : Node) -> bool:
+    return type(node) in LITERALS
+
+def make_literal(value : MapleType) -> Node | None:
+    if isinstance(value, MapleBOOLEAN):
+        return BooleanNode(Token(TT_BOOLEAN, "true" if value.value else "false"))
+    if isinstance(value, MapleINT) and type(value.value) in (int, float):
+        node = NumberNode(Token(TT_INT, value.value))
+    elif isinstance(value, MapleFLOAT) and type(value.value) is float:
+        node = NumberNode(Token(TT_FLOAT, value.value))
+    elif isinstance(value, MapleSTRING):
+        node = StringNode(Token(TT_STRING, value.value))
+    else:
+        return None
+    node.constant = value
+    return node
+
+# Type of a node's value when it can be told without evaluating it. Types #
+# found for the node's subtree are kept in `types`, and reused from it.   #
+def static_type(node : Node, types : dict | None = None) -> type | None:
+    types = {} if types is None else types
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if current in types:
+            stack.pop()
+            continue
+        if isinstance(current, AbsoluteNode):
+            pending = [child for child in (current.node,) if child not in types]
+        elif isinstance(current, BinOpNode):
+            pending = [child for child in (current.left, current.right) if child not in types]
+        else:
+            pending = None
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        types[current] = local_type(current, types)
+    return types[node]
+
+# Type of a node given the types of its operands #
+def local_type(node : Node, types : dict) -> type | None:
+    if is_literal(node):
+        value = literal(node)
+        if isinstance(value, MapleINT) and type(value.value) is not int:
+            return None
+        return type(value)
+    if isinstance(node, AbsoluteNode):
+        subscript = types[node.node]
+        return subscript if subscript in NUMERIC else None
+    if isinstance(node, BinOpNode):
+        left, right = types[node.left], types[node.right]
+        if left in NUMERIC and right in NUMERIC:
+            if node.op.type in (TT_PLUS, TT_MINUS, TT_MUL):
+                return MapleINT if left is right is MapleINT else MapleFLOAT
+            if node.op.type == TT_DIV:
+                return MapleFLOAT
+        if left is right is MapleBOOLEAN and node.op.type in (TT_AND, TT_OR):
+            return MapleBOOLEAN
+    return None
+
+# Operations giving back their other operand, as (operator, side of the literal, literal type, literal value) #
+IDENTITIES = {
+    (TT_PLUS, "left", MapleINT, 0),
+    (TT_PLUS, "right", MapleINT, 0),
+    (TT_MINUS, "right", MapleINT, 0),
+    (TT_MUL, "left", MapleINT, 1),
+    (TT_MUL, "right", MapleINT, 1),
+    (TT_POW, "right", MapleINT, 1),
+    (TT_AND, "left", MapleBOOLEAN, True),
+    (TT_AND, "right", MapleBOOLEAN, True),
+    (TT_OR, "left", MapleBOOLEAN, False),
+    (TT_OR, "right", MapleBOOLEAN, False),
+}
+
+def identity(node : BinOpNode, types : dict | None = None) -> Node | None:
+    for constant, other, side in ((node.left, node.right, "left"), (node.right, node.left, "right")):
+        if not is_literal(constant):
+            continue
+        value = literal(constant)
+        if type(value.value) not in (int, bool) or (node.op.type, side, type(value), value.value) not in IDENTITIES:
+            continue
+        if static_type(other, types) is type(value):
+            return other
+    return None
+
+class Folder:
+    def __init__(self):
+        self.eliminated = 0
+        self.types : dict = {} # static types found while folding a statement #
+
+    def fold(self, node : Node) -> Node:
+        try:
+            folded = self.visit(node)
+        finally:
+            self.types.clear()
+        if node.position is not None:
+            folded.position = node.position
+        return folded
+
+    # Walked children first with postvisit; nodes without a visit method are kept #
+    def visit(self, node : Node) -> Node:
+        if isinstance(node, ScriptNode):
+            return self.visit_ScriptNode(node)
+        return postvisit(self, node, self.keep)
+
+    def keep(self, node : Node) -> Node:
+        return node
+
+    def replace(self, node : Node, value : MapleType, removed : int) -> Node:
+        folded = make_literal(value)
+        if not folded:
+            return node
+        self.eliminated += removed
+        return folded
+
+    def visit_ScriptNode(self, node : ScriptNode):
+        node.statements = [self.fold(statement) for statement in node.statements]
+        return node
+
+    def visit_ArrayNode(self, node : ArrayNode):
+        node.elements = [self.visit(e) for e in node.elements]
+        return node
+
+    def visit_BinOpNode(self, node : BinOpNode):
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+
+        if is_literal(node.left) and is_literal(node.right):
+            left, right = literal(node.left), literal(node.right)
+            if not foldable(node.op.type, left, right):
+                return node
+            try:
+                value = dispatch(BINARY_OPERATIONS[node.op.type], left, right)
+            except (MapleError, ArithmeticError):
+                return node
+            return self.replace(node, value, 2)
+
+        other = identity(node, self.types)
+        if other:
+            self.eliminated += 2
+            return other
+        return node
+
+    def visit_NegationNode(self, node : NegationNode):
+        node.node = self.visit(node.node)
+        if is_literal(node.node):
+            subscript = literal(node.node)
+            if isinstance(subscript, MapleBOOLEAN) or isinstance(subscript, MapleINT) and fits_factorial(subscript.value):
+                return self.replace(node, subscript.op_compare_not(), 1)
+        return node
+
+    def visit_AbsoluteNode(self, node : AbsoluteNode):
+        node.node = self.visit(node.node)
+        if is_literal(node.node):
+            subscript = literal(node.node)
+            if isinstance(subscript, NUMERIC):
+                return self.replace(node, subscript.op_abs(), 1)
+        return node
+
+    def visit_GetAttributeNode(self, node : GetAttributeNode):
+        node.node = self.visit(node.node)
+        return node
+
+    def visit_SetAttributeNode(self, node : SetAttributeNode):
+        node.node = self.visit(node.node)
+        node.value = self.visit(node.value)
+        return node
+
+    def visit_GetIndexNode(self, node : GetIndexNode):
+        node.node = self.visit(node.node)
+        node.index = self.visit(node.index)
+        return node
+
+    def visit_InvokeNode(self, node : InvokeNode):
+        node.node = self.visit(node.node)
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
@@ -0,0 +1,100 @@
+from maple import *
+import multiprocessing
+
+# Statements writing state that another statement could read can't be run #
+# apart from the rest. Attribute writes are the only ones for now; nodes    #
+# binding names belong here once the language gets variables.               #
+SHARED_STATE = (SetAttributeNode,)
+
+CHUNKS_PER_WORKER = 4
+
+# Statements are pickled to reach the pool, which recurses through their #
+# nodes, so more deeply nested ones are kept in this process.            #
+PICKLE_NESTING = NESTING_LIMIT
+
+# Whether a statement has to run in this process: it shares state, or it #
+# is nested too deeply to be pickled.                                     #
+def pinned(statement : Node) -> bool:
+    stack = [(statement, 1)]
+    while stack:
+        node, nesting = stack.pop()
+        if isinstance(node, SHARED_STATE) or nesting > PICKLE_NESTING:
+            return True
+        for value in vars(node).values():
+            if isinstance(value, Node):
+                stack.append((value, nesting + 1))
+            elif isinstance(value, list):
+                stack.extend((item, nesting + 1) for item in value)
+    return False
+
+# Splits the statements into runs of independent statements, which may be #
+# spread over the pool, and single pinned statements, which wait for      #
+# everything before them and run in this process.                        #
+def segments(statements : list[Node]) -> Iterable[tuple[bool, list[Node]]]:
+    run = []
+    for statement in statements:
+        if pinned(statement):
+            if run:
+                yield True, run
+                run = []
+            yield False, [statement]
+        else:
+            run.append(statement)
+    if run:
+        yield True, run
+
+def split(statements : list[Node], chunks : int) -> list[list[Node]]:
+    size = -(-len(statements) // chunks)
+    return [statements[i:i + size] for i in range(0, len(statements), size)]
+
+# Runs in a worker, returning the results with the bytes the chunk spent. #
+# Errors are pickled back and raised by the pool in the parent, in        #
+# statement order.                                                        #
+def run_statements(job : tuple) -> tuple[list, int | float]:
+    engine, statements, budget, deadline = job
+    with limited(budget, deadline) as meter:
+        results = list(runner(engine).execute(statements))
+    return results, meter.memory if meter is not None else 0
+
+# What is left of a run's budget for a chunk sent to the pool: its steps are #
+# charged by the parent up front and its deadline is the run's, so only the  #
+# remaining memory is handed over, and the bits of every result as they are. #
+def remaining(meter : BudgetMeter | None) -> Budget | None:
+    if meter is None:
+        return None
+    budget = meter.budget
+    memory = budget.memory - meter.memory if budget.memory is not None else None
+    return Budget(None, budget.seconds, budget.bits, memory)
+
+class ParallelExecutor:
+    def __init__(self, workers : int | None = None, engine : str = "tree", budget : Budget | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.budget = budget
+
+    # The budget covers the whole run: chunks sent to the pool are charged #
+    # to the meter of the statements run here, which stays the only one.    #
+    def run(self, ast : ScriptNode) -> list:
+        results = []
+        pool = None
+        try:
+            with limited(self.budget) as meter:
+                for independent, statements in segments(ast.statements):
+                    if not independent or len(statements) < 2 or self.workers < 2:
+                        results.extend(runner(self.engine).execute(statements))
+                        continue
+
+                    if pool is None:
+                        pool = multiprocessing.Pool(self.workers)
+                    if meter is not None:
+                        meter.charge(sum(tree_size(statement) for statement in statements))
+                    deadline = meter.deadline if meter is not None else None
+                    jobs = [(self.engine, chunk, remaining(meter), deadline) for chunk in split(statements, self.workers * CHUNKS_PER_WORKER)]
+                    for returned, memory in pool.imap(run_statements, jobs):
+                        results.extend(returned)
+                        if meter is not None:
+                            meter.spend(memory)
+        finally:
+            if pool is not None:
+                pool.terminate()
+        return results
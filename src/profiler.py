@@ -0,0 +1,168 @@
+from maple import *
+from contextlib import contextmanager
+import bisect, json, re, time
+
+PROFILE_LIMIT = 20 # rows of each table in the printed report #
+
+# Timings gathered by a profiled run: seconds spent in every phase, calls #
+# and self/cumulative seconds per node type, seconds per statement, and   #
+# the nodes constant folding eliminated.                                  #
+class Profile:
+    def __init__(self, source : str | bytes = ""):
+        self.newlines = [found.start() for found in re.finditer("\n" if isinstance(source, str) else b"\n", source)]
+        self.phases : dict[str, float] = {}
+        self.nodes : dict[str, list] = {}
+        self.statements : list[tuple[int, int | None, float]] = []
+        self.eliminated = 0
+
+    @contextmanager
+    def phase(self, name : str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, key : str, own : float, cumulative : float):
+        entry = self.nodes.get(key)
+        if entry is None:
+            entry = self.nodes[key] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += own
+        entry[2] += cumulative
+
+    def statement(self, index : int, position : int | None, seconds : float):
+        self.statements.append((index, position, seconds))
+
+    def line(self, position : int | None) -> int | None:
+        if position is None:
+            return None
+        return bisect.bisect_left(self.newlines, position) + 1
+
+    def to_json(self) -> dict:
+        return {
+            "phases" : self.phases,
+            "eliminated" : self.eliminated,
+            "nodes" : [
+                {"node" : key, "calls" : calls, "self" : own, "cumulative" : cumulative}
+                for key, (calls, own, cumulative) in sorted(self.nodes.items(), key=lambda item: -item[1][1])
+            ],
+            "statements" : [
+                {"index" : index, "position" : position, "line" : self.line(position), "seconds" : seconds}
+                for index, position, seconds in self.statements
+            ],
+        }
+
+    def format(self, limit : int = PROFILE_LIMIT) -> str:
+        lines = ["Phases:"]
+        total = sum(self.phases.values()) or 1.0
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name:<10} {seconds:>10.4f}s {100 * seconds / total:>6.1f}%")
+        if "fold" in self.phases:
+            lines.append(f"Nodes eliminated by folding: {self.eliminated}")
+
+        if self.nodes:
+            lines.append("Node types, by self time:")
+            lines.append(f"  {'calls':>10} {'self':>10} {'cumulative':>11}  node")
+            for key, (calls, own, cumulative) in sorted(self.nodes.items(), key=lambda item: -item[1][1])[:limit]:
+                lines.append(f"  {calls:>10} {own:>9.4f}s {cumulative:>10.4f}s  {key}")
+
+        if self.statements:
+            lines.append("Slowest statements:")
+            lines.append(f"  {'index':>8} {'line':>6} {'seconds':>10}")
+            for index, position, seconds in sorted(self.statements, key=lambda item: -item[2])[:limit]:
+                lines.append(f"  {index:>8} {self.line(position) or '?':>6} {seconds:>10.4f}")
+        return "\n".join(lines)
+
+# An interpreter timing every visit method it runs into `profile`. The plain #
+# Interpreter is left alone, so profiling costs nothing unless asked for.    #
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, ast : Node | None = None, profile : Profile | None = None):
+        super().__init__(ast)
+        self.profile = profile if profile is not None else Profile()
+        self.pending : dict[Node, tuple] = {} # cumulative seconds of finished nodes, and the share counted per type below them, until their parent finishes #
+        self.nested : list[float] = []        # seconds spent in timed calls made by each running visit method #
+
+        # Instance attributes shadow the class's methods for postvisit too #
+        for name in dir(Interpreter):
+            if name.startswith("visit_") and name not in ("visit_error", "visit_ScriptNode"):
+                setattr(self, name, self.timed(getattr(self, name)))
+
+    # Self time excludes the timed calls made from the method; a node's    #
+    # cumulative time adds its children's, whether they ran inside the     #
+    # method or, for deeply nested subtrees, before it (see postvisit). As #
+    # with cProfile, a node type's cumulative total only counts the nodes  #
+    # without an ancestor of the same type.                                #
+    def timed(self, method):
+        profile, pending, nested = self.profile, self.pending, self.nested
+        clock = time.perf_counter
+
+        def timed_method(node : Node):
+            nested.append(0.0)
+            start = clock()
+            try:
+                return method(node)
+            finally:
+                elapsed = clock() - start
+                own = elapsed - nested.pop()
+                if nested:
+                    nested[-1] += elapsed
+                cumulative = own
+                counted = None
+                for child in node.children():
+                    seconds, below = pending.pop(child, (0.0, None))
+                    cumulative += seconds
+                    if counted is None:
+                        counted = below
+                    elif below:
+                        for key, value in below.items():
+                            counted[key] = counted.get(key, 0.0) + value
+                if counted is None:
+                    counted = {}
+
+                key = f"BinOpNode {node.op.type}" if isinstance(node, BinOpNode) else type(node).__name__
+                profile.record(key, own, cumulative - counted.get(key, 0.0))
+                counted[key] = cumulative
+                pending[node] = (cumulative, counted)
+
+        return timed_method
+
+    def execute(self, statements : Iterable[Node]):
+        for index, statement in enumerate(statements):
+            start = time.perf_counter()
+            try:
+                value, = super().execute((statement,))
+            finally:
+                self.profile.statement(index, statement.position, time.perf_counter() - start)
+                self.pending.clear()
+                self.nested.clear()
+            yield value
+
+# Runs `source` from scratch with every phase timed into `profile`. Nodes and #
+# statements are only profiled on the tree engine.                           #
+def run_profiled(source : str | bytes, profile : Profile, engine : str = "tree", fold : bool = True) -> list:
+    with profile.phase("lex"):
+        tokens = Lexer(source).tokenize()
+    with profile.phase("parse"):
+        ast = Parser(tokens).parse()
+    if fold:
+        folder = Folder()
+        with profile.phase("fold"):
+            ast = folder.fold(ast)
+        profile.eliminated = folder.eliminated
+
+    if engine == "tree":
+        with profile.phase("eval"):
+            return ProfilingInterpreter(ast, profile).run()
+
+    with profile.phase("compile"):
+        code = prepare(freeze(ast), engine)
+    with profile.phase("eval"):
+        return runner(engine, code).run()
+
+def write_profile(profile : Profile, path : str | None = None):
+    if path:
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(profile.to_json(), output, indent=2)
+    else:
+        print(profile.format(), file=sys.stderr)
@@ -0,0 +1,66 @@
+from maple import *
+from client import send_message, receive_message
+import socketserver, stat
+
+def failure(kind : str, message : str) -> dict:
+    return {"results" : [], "error" : {"kind" : kind, "message" : message, "position" : None}}
+
+class MapleRequestHandler(socketserver.BaseRequestHandler):
+    # A connection may send any number of requests, answered in order #
+    def handle(self):
+        while True:
+            try:
+                message = receive_message(self.request)
+            except ValueError as error:
+                send_message(self.request, failure("ProtocolException", f"{error}"))
+                return
+            except OSError:
+                return
+            if message is None:
+                return
+            send_message(self.request, self.server.answer(message))
+
+def stale_socket(path : str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class MapleServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        # `budget` limits every request's run apart #
+        def __init__(self, path : str, cache : ParseCache = PARSE_CACHE, budget : Budget | None = None):
+            self.path = path
+            self.cache = cache
+            self.budget = budget
+            # Only a stale socket is replaced, never any other kind of file #
+            if os.path.lexists(path):
+                if not stale_socket(path):
+                    report("ArgumentException", f"`{path}` already exists and isn't a socket.")
+                os.remove(path)
+            super().__init__(path, MapleRequestHandler)
+
+        def answer(self, message : dict) -> dict:
+            if not isinstance(message, dict) or not isinstance(message.get("source"), str):
+                return failure("ProtocolException", "Expected a request with a `source` string.")
+            try:
+                values = evaluate(message["source"], message.get("engine", "tree"), bool(message.get("fold", True)), self.cache, self.budget)
+                return {"results" : [represent(value) for value in values], "error" : None}
+            except Exception as error:
+                return {"results" : [], "error" : describe(error)}
+
+        def server_close(self):
+            super().server_close()
+            if stale_socket(self.path):
+                os.remove(self.path)
+
+def serve(path : str, budget : Budget | None = None):
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        report("DeveloperFailureException", "Unix domain sockets aren't supported on this platform.")
+    with MapleServer(path, budget=budget) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
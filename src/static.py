@@ -1,4 +1,8 @@
 from typegraph import *
+from typing import Iterable
+import re, copy, asyncio
+
+MAPLE_VERSION = "0.1"
 
 TT_INT        = "INT"
 TT_FLOAT      = "FLOAT"
@@ -41,19 +45,103 @@ TT_EOF        = "EOF"
 
 ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_"
 
-KEYWORDS = [
+KEYWORDS = {
     "if",
     "else",
     "func",
     "for",
     "while",
     "log",
-]
+}
+
+TOKEN_PATTERN = r"""
+    [ \t\r\n]*
+    (?:
+        (?P<FLOAT>-?[0-9]+\.[0-9]+|-?[0-9]+\.\Z)
+      | (?P<INT>-?[0-9]+)
+      | (?P<OPERATOR>\*\*\*|\*\*|\|\||&&|!=|==|>=|<=|[-+*/%|&!=<>(){}\[\];.,])
+      | (?P<NAMESPACE>[a-zA-Z_]+)
+      | (?P<STRING>"[^"]*"|'[^']*')
+      | (?P<END>\Z)
+    )
+"""
+TOKEN_REGEX = re.compile(TOKEN_PATTERN, re.VERBOSE)
+
+OPERATORS = {
+    "&"   : None,
+    "+"   : TT_PLUS,
+    "-"   : TT_MINUS,
+    "*"   : TT_MUL,
+    "/"   : TT_DIV,
+    "**"  : TT_POW,
+    "%"   : TT_MOD,
+    "***" : TT_TETR,
+    "|"   : TT_ABS,
+    "("   : TT_LPAREN,
+    ")"   : TT_RPAREN,
+    "{"   : TT_LARRAY,
+    "}"   : TT_RARRAY,
+    "["   : TT_LINDEX,
+    "]"   : TT_RINDEX,
+    "||"  : TT_OR,
+    "&&"  : TT_AND,
+    "!"   : TT_NOT,
+    "=="  : TT_EQ,
+    "!="  : TT_NEQ,
+    ">"   : TT_GT,
+    ">="  : TT_GTE,
+    "<"   : TT_LT,
+    "<="  : TT_LTE,
+    "="   : TT_ASSIGN,
+    "."   : TT_DOT,
+    ","   : TT_COMMA,
+    ";"   : TT_SEMICOLON,
+}
+
+BINARY_TOKEN_REGEX = re.compile(TOKEN_PATTERN.encode(), re.VERBOSE)
+BINARY_OPERATORS = {lexeme.encode() : _type for lexeme, _type in OPERATORS.items()}
+
+# Operators which can't end the source, with their error reports #
+DANGLING = {
+    TT_MINUS  : ("SyntaxError", "Expected characters after `-`."),
+    TT_MUL    : ("SyntaxError", "Expected characters after `*`."),
+    TT_POW    : ("SyntaxError", "Expected characters after `*`."),
+    TT_ABS    : ("SyntaxError", "Unknown operator: `|`. Did you mean `||` or `| ... |`?"),
+    TT_NOT    : ("SyntaxError", "Expected characters after `!`."),
+    TT_ASSIGN : ("SyntaxError", "Expected characters after `=`."),
+    TT_GT     : ("SyntaxError", "Expected characters after `>`."),
+    TT_LT     : ("SyntaxError", "Expected characters after `<`."),
+}
+
+WHITESPACE = (" ", "\t", "\r", "\n", b" ", b"\t", b"\r", b"\n")
+
+LEXER_ENGINES = ("regex", "scan")
+
+BINARY_OPERATIONS = {
+    TT_PLUS  : "op_plus",
+    TT_MINUS : "op_minus",
+    TT_MUL   : "op_mul",
+    TT_POW   : "op_pow",
+    TT_DIV   : "op_div",
+    TT_MOD   : "op_mod",
+    TT_TETR  : "op_tetr",
+    TT_AND   : "op_compare_and",
+    TT_OR    : "op_compare_or",
+    TT_EQ    : "op_compare_eq",
+    TT_NEQ   : "op_compare_neq",
+    TT_GT    : "op_compare_gt",
+    TT_GTE   : "op_compare_gte",
+    TT_LT    : "op_compare_lt",
+    TT_LTE   : "op_compare_lte",
+}
 
 class Token:
-    def __init__(self, _type : str, value = None):
+    __slots__ = ("type", "value", "position")
+
+    def __init__(self, _type : str, value = None, position : int | None = None):
         self.type = _type
         self.value = value
+        self.position = position
 
     def __repr__(self) -> str:
         if self.value:
@@ -61,7 +149,11 @@ class Token:
         return f"{self.type}"
 
 class Lexer:
-    def __init__(self, text : str):
+    # `text` may also be a bytes-like object such as a memory-mapped file #
+    def __init__(self, text : str | bytes, engine : str = "regex"):
+        if engine not in LEXER_ENGINES:
+            report("DeveloperFailureException", f"Unknown lexer engine: `{engine}`.")
+        self.engine = engine
         self.pos = -1
         self.text = text
         self.char = None
@@ -78,10 +170,83 @@ class Lexer:
         return self.char
 
     def tokenize(self):
+        if self.engine == "scan":
+            return self.scan()
+
+        self.tokens.clear()
+        self.tokens.extend(self.stream())
+        return self.tokens
+
+    def stream(self):
+        if self.engine == "scan":
+            yield from self.scan()
+            return
+
+        text = self.text
+        if isinstance(text, str):
+            regex, operators, binary = TOKEN_REGEX, OPERATORS, False
+        else:
+            regex, operators, binary = BINARY_TOKEN_REGEX, BINARY_OPERATORS, True
+        end = len(text)
+        pos = 0
+
+        for found in regex.finditer(text):
+            if found.start() != pos:
+                self.unexpected(pos)
+            pos = found.end()
+            kind = found.lastgroup
+            start = found.start(kind)
+
+            if kind == "OPERATOR":
+                _type = operators[found.group(kind)]
+                if not _type:
+                    report("SyntaxException", "Unknown operator: `&`. Did you mean `&&`?", start)
+                if pos == end and _type in DANGLING:
+                    report(*DANGLING[_type], start)
+                yield Token(_type, None, start)
+            elif kind == "INT":
+                yield Token(TT_INT, int(found.group(kind)), start)
+            elif kind == "NAMESPACE":
+                lexeme = found.group(kind)
+                if binary:
+                    lexeme = lexeme.decode()
+                if lexeme in KEYWORDS:
+                    yield Token(TT_KEYWORD, lexeme, start)
+                elif lexeme in ("true", "false"):
+                    yield Token(TT_BOOLEAN, lexeme, start)
+                else:
+                    yield Token(TT_NAMESPACE, lexeme, start)
+            elif kind == "FLOAT":
+                yield Token(TT_FLOAT, float(found.group(kind)), start)
+            elif kind == "STRING":
+                lexeme = found.group(kind)[1:-1]
+                yield Token(TT_STRING, lexeme.decode() if binary else lexeme, start)
+
+        if pos != end:
+            self.unexpected(pos)
+
+        yield Token(TT_EOF, None, end)
+
+    def unexpected(self, pos : int):
+        text = self.text
+        while text[pos:pos + 1] in WHITESPACE:
+            pos += 1
+        char = text[pos:pos + 4]
+        if not isinstance(char, str):
+            char = char.decode(errors="ignore")
+        char = char[:1]
+        if char in ("'", "\""):
+            report("SyntaxError", f"Expected `{char}`", pos)
+        report("SyntaxException", f"Unexpected character: `{char}`.", pos)
+
+    def scan(self):
         self.tokens.clear()
 
         while self.char:
-            if self.char in " \n":
+            start = self.pos
+            count = len(self.tokens)
+
+            if self.char in " \t\r\n":
                 self.advance()
             elif self.char == "+":
                 self.tokens.append(Token(TT_PLUS))
@@ -89,7 +254,7 @@ class Lexer:
             elif self.char == "-":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Expected characters after `-`.")
+                    report("SyntaxError", "Expected characters after `-`.", start)
                 if self.char in "0123456789":
                     self.make_number(True)
                 else:
@@ -97,11 +262,11 @@ class Lexer:
             elif self.char == "*":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Expected characters after `*`.")
+                    report("SyntaxError", "Expected characters after `*`.", start)
                 if self.char == "*":
                     self.advance()
                     if not self.char:
-                        report("SyntaxError", "Expected characters after `*`.")
+                        report("SyntaxError", "Expected characters after `*`.", start)
                     if self.char == "*":
                         self.tokens.append(Token(TT_TETR))
                         self.advance()
@@ -118,7 +283,7 @@ class Lexer:
             elif self.char == "|":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Unknown operator: `|`. Did you mean `||` or `| ... |`?")
+                    report("SyntaxError", "Unknown operator: `|`. Did you mean `||` or `| ... |`?", start)
                 if self.char == "|":
                     self.tokens.append(Token(TT_OR))
                     self.advance()
@@ -127,12 +292,12 @@ class Lexer:
             elif self.char == "&":
                 self.advance()
                 if not self.char:
-                    report("SyntaxException", "Unknown operator: `&`. Did you mean `&&`?")
+                    report("SyntaxException", "Unknown operator: `&`. Did you mean `&&`?", start)
                 if self.char == "&":
                     self.tokens.append(Token(TT_AND))
                     self.advance()
                 else:
-                    report("SyntaxException", "Unknown operator: `&`. Did you mean `&&`?")
+                    report("SyntaxException", "Unknown operator: `&`. Did you mean `&&`?", start)
             elif self.char == "(":
                 self.tokens.append(Token(TT_LPAREN))
                 self.advance()
@@ -157,7 +322,7 @@ class Lexer:
             elif self.char == "!":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Expected characters after `!`.")
+                    report("SyntaxError", "Expected characters after `!`.", start)
                 if self.char == "=":
                     self.tokens.append(Token(TT_NEQ))
                     self.advance()
@@ -166,7 +331,7 @@ class Lexer:
             elif self.char == "=":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Expected characters after `=`.")
+                    report("SyntaxError", "Expected characters after `=`.", start)
                 if self.char == "=":
                     self.tokens.append(Token(TT_EQ))
                     self.advance()
@@ -175,7 +340,7 @@ class Lexer:
             elif self.char == ">":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Expected characters after `>`.")
+                    report("SyntaxError", "Expected characters after `>`.", start)
                 if self.char == "=":
                     self.tokens.append(Token(TT_GTE))
                     self.advance()
@@ -184,7 +349,7 @@ class Lexer:
             elif self.char == "<":
                 self.advance()
                 if not self.char:
-                    report("SyntaxError", "Expected characters after `<`.")
+                    report("SyntaxError", "Expected characters after `<`.", start)
                 if self.char == "=":
                     self.tokens.append(Token(TT_LTE))
                     self.advance()
@@ -202,8 +367,14 @@ class Lexer:
                 self.make_string()
             elif self.char in ALPHABET:
                 self.make_namespace()
+            else:
+                self.unexpected(start)
+
+            for token in self.tokens[count:]:
+                if token.position is None:
+                    token.position = start
 
-        self.tokens.append(Token(TT_EOF))
+        self.tokens.append(Token(TT_EOF, None, len(self.text)))
         return self.tokens
 
     def make_number(self, negative : bool = False):
@@ -225,8 +396,8 @@ class Lexer:
                 break
             if num[len(num) - 1] == "." and dot == 1:
                 if self.char not in "0123456789":
-                    self.tokens.append(Token(TT_INT, num[:len(num) - 1]))
-                    self.tokens.append(Token(TT_DOT))
+                    self.tokens.append(Token(TT_INT, int(num[:len(num) - 1])))
+                    self.tokens.append(Token(TT_DOT, None, self.pos - 1))
                     return
             if not self.char in "0123456789.":
                 break
@@ -236,16 +407,17 @@ class Lexer:
         else:
             self.tokens.append(Token(TT_INT, int(num)))
         if dot > 1:
-            self.tokens.append(Token(TT_DOT))
+            self.tokens.append(Token(TT_DOT, None, self.pos - 1))
 
     def make_string(self):
         string = ""
         starter = self.char
+        start = self.pos
         self.advance()
 
         while True:
             if self.char == None:
-                report("SyntaxError", f"Expected `{starter}`")
+                report("SyntaxError", f"Expected `{starter}`", start)
             if self.char == starter:
                 self.advance()
                 break
@@ -275,18 +447,27 @@ class Lexer:
 
 
 
-class Node: pass
+class Node:
+    position : int | None = None # source offset, set on statements by the parser #
+
+    # Child nodes, in the order they're evaluated #
+    def children(self) -> tuple:
+        return ()
 
 class ScriptNode(Node):
     def __init__(self, statements : list[Node]):
         self.statements = statements
 
+    def children(self) -> tuple:
+        return tuple(self.statements)
+
     def __repr__(self) -> str:
         return f"*({self.statements})"
 
 class NumberNode(Node):
     def __init__(self, token : Token):
         self.token = token
+        self.constant = None
 
     def __repr__(self) -> str:
         return f"{self.token.value}n"
@@ -294,6 +475,7 @@ class NumberNode(Node):
 class StringNode(Node):
     def __init__(self, token : Token):
         self.token = token
+        self.constant = None
 
     def __repr__(self) -> str:
         return f"'{self.token.value}'"
@@ -309,6 +491,9 @@ class ArrayNode(Node):
     def __init__(self, elements : list[Node]):
         self.elements = elements
 
+    def children(self) -> tuple:
+        return tuple(self.elements)
+
     def __repr__(self) -> str:
         return "{" + f"{self.elements}" + "}"
 
@@ -318,6 +503,9 @@ class BinOpNode(Node):
         self.op = op
         self.right = right
 
+    def children(self) -> tuple:
+        return (self.left, self.right)
+
     def __repr__(self) -> str:
         return f"({self.left}, {self.op}, {self.right})"
 
@@ -325,6 +513,9 @@ class NegationNode(Node):
     def __init__(self, node : Node):
         self.node = node
 
+    def children(self) -> tuple:
+        return (self.node,)
+
     def __repr__(self) -> str:
         return f"!({self.node})"
 
@@ -332,6 +523,9 @@ class AbsoluteNode(Node):
     def __init__(self, node : Node):
         self.node = node
 
+    def children(self) -> tuple:
+        return (self.node,)
+
     def __repr__(self) -> str:
         return f"|{self.node}|"
 
@@ -340,6 +534,9 @@ class GetAttributeNode(Node):
         self.node = node
         self.attribute = attribute
 
+    def children(self) -> tuple:
+        return (self.node,)
+
     def __repr__(self) -> str:
         return f"{self.node}.{self.attribute}"
 
@@ -349,6 +546,9 @@ class SetAttributeNode(Node):
         self.attribute = attribute
         self.value = value
 
+    def children(self) -> tuple:
+        return (self.node, self.value)
+
     def __repr__(self) -> str:
         return f"<{self.node}.{self.attribute} = {self.value}>"
 
@@ -357,6 +557,9 @@ class InvokeNode(Node):
         self.node = node
         self.args = args
 
+    def children(self) -> tuple:
+        return (self.node, *self.args)
+
     def __repr__(self) -> str:
         return f"{self.node}{self.args}"
 
@@ -365,259 +568,499 @@ class GetIndexNode(Node):
         self.node = node
         self.index = index
 
+    def children(self) -> tuple:
+        return (self.node, self.index)
+
     def __repr__(self) -> str:
         return f"{self.node}[{self.index}]"
 
 
 
+def literal(node : NumberNode | StringNode | BooleanNode) -> MapleType:
+    if type(node) is BooleanNode:
+        return MapleBOOLEAN.of(node.token.value == "true")
+    if node.constant is None:
+        if node.token.type == TT_INT:
+            node.constant = MapleINT.of(node.token.value)
+        elif node.token.type == TT_FLOAT:
+            node.constant = MapleFLOAT(node.token.value)
+        elif node.token.type == TT_STRING:
+            node.constant = MapleSTRING(node.token.value)
+    return node.constant
+
+# Key telling constants apart in a compiled constant pool; equality alone #
+# would merge 0.0 with -0.0, so FLOATs are keyed by their sign as well.  #
+def constant_key(value : MapleType) -> tuple:
+    key = (type(value), type(value.value), value.value)
+    if type(value.value) is float:
+        key += (math.copysign(1.0, value.value),)
+    return key
+
+
+
+# Precedence levels of the expression grammar, loosest first #
+LEVEL_LOGIC  = 0
+LEVEL_COMP   = 1
+LEVEL_EXPR   = 2
+LEVEL_TERM   = 3
+LEVEL_POWER  = 4
+LEVEL_FACTOR = 5
+
+OPERATOR_LEVELS = {
+    TT_AND   : LEVEL_LOGIC,
+    TT_OR    : LEVEL_LOGIC,
+    TT_EQ    : LEVEL_COMP,
+    TT_NEQ   : LEVEL_COMP,
+    TT_GT    : LEVEL_COMP,
+    TT_GTE   : LEVEL_COMP,
+    TT_LT    : LEVEL_COMP,
+    TT_LTE   : LEVEL_COMP,
+    TT_PLUS  : LEVEL_EXPR,
+    TT_MINUS : LEVEL_EXPR,
+    TT_MUL   : LEVEL_TERM,
+    TT_DIV   : LEVEL_TERM,
+    TT_MOD   : LEVEL_TERM,
+    TT_POW   : LEVEL_POWER,
+    TT_TETR  : LEVEL_POWER,
+}
+
+# Kinds of the parser's pending-work frames #
+FRAME_OPERAND  = 0 # (kind, lowest level) waiting for an operand #
+FRAME_OPERATOR = 1 # (kind, level, left, operator, lowest level) waiting for the right operand #
+FRAME_POSTFIX  = 2 # waiting for an expression to apply postfix operations to #
+FRAME_NOT      = 3
+FRAME_ARRAY    = 4 # (kind, elements) #
+FRAME_ABS      = 5
+FRAME_PAREN    = 6
+FRAME_ARGS     = 7 # (kind, invoked node, arguments) #
+FRAME_INDEX    = 8 # (kind, indexed node) #
+
+# Nodes of the tree below `root`, children first in evaluation order, each #
+# with the number of values evaluated before it and still waiting for their #
+# parent: its slot on an evaluation stack.                                  #
+def postorder(root : Node) -> Iterable[tuple[Node, int]]:
+    height = 0
+    stack = [(root, None, 0)]
+    while stack:
+        node, count, depth = stack.pop()
+        if count is None:
+            children = node.children()
+            stack.append((node, len(children), height))
+            stack.extend((child, None, 0) for child in reversed(children))
+        else:
+            height -= count
+            yield node, depth
+            height += 1
+
+# Number of nodes below `root`, which is also the number of steps taken to #
+# evaluate it: the language has neither loops nor calls of its own.       #
+def tree_size(root : Node) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        count += 1
+        stack.extend(stack.pop().children())
+    return count
+
+# Nesting handled by plain recursion before postvisit switches a subtree over #
+# to an explicit stack; two Python frames are spent per level.               #
+NESTING_LIMIT = 128
+
+# Applies a visitor's visit_* methods to the tree below `root`, children     #
+# through `visitor.visit` as usual. Past NESTING_LIMIT levels a subtree is   #
+# walked without recursing: its children are handled first, and `visit`     #
+# hands the methods back what was returned for a child instead of visiting   #
+# it. With a `depth`, methods also get the node's evaluation stack slot.     #
+def postvisit(visitor, root : Node, fallback, depth : int | None = None):
+    handlers = {}
+    nesting = 0
+
+    def handler(node : Node):
+        found = handlers[type(node)] = getattr(visitor, f"visit_{type(node).__name__}", fallback)
+        return found
+
+    def visit(node : Node):
+        nonlocal nesting
+        if nesting >= NESTING_LIMIT:
+            return unwind(node)
+        nesting += 1
+        try:
+            return (handlers.get(type(node)) or handler(node))(node)
+        finally:
+            nesting -= 1
+
+    def visit_at(node : Node, depth : int):
+        nonlocal nesting
+        if nesting >= NESTING_LIMIT:
+            return unwind_at(node, depth)
+        nesting += 1
+        try:
+            return (handlers.get(type(node)) or handler(node))(node, depth)
+        finally:
+            nesting -= 1
+
+    # A finished node is pushed again as a 1-tuple, leaves are done at once #
+    def unwind(root : Node):
+        results = {}
+        visitor.visit = results.pop
+        stack = [root]
+        push = stack.append
+        pop = stack.pop
+        extend = stack.extend
+        try:
+            while stack:
+                node = pop()
+                if type(node) is tuple:
+                    node = node[0]
+                else:
+                    children = node.children()
+                    if children:
+                        push((node,))
+                        extend(reversed(children))
+                        continue
+                results[node] = (handlers.get(type(node)) or handler(node))(node)
+            return results.pop(root)
+        finally:
+            visitor.visit = visit
+
+    def unwind_at(root : Node, depth : int):
+        results = {}
+        visitor.visit = lambda node, _: results.pop(node)
+        try:
+            for node, slot in postorder(root):
+                results[node] = (handlers.get(type(node)) or handler(node))(node, depth + slot)
+            return results.pop(root)
+        finally:
+            visitor.visit = visit_at
+
+    try:
+        if depth is None:
+            visitor.visit = visit
+            return visit(root)
+        visitor.visit = visit_at
+        return visit_at(root, depth)
+    finally:
+        del visitor.visit
+
+
 class Parser:
-    def __init__(self, tokens : list[Token] = []):
-        self.tokens = tokens
-        self.pos = -1
+    # `tokens` may be any iterable, e.g. a `Lexer.stream()` generator #
+    def __init__(self, tokens : Iterable[Token] = ()):
+        self.tokens = iter(tokens)
         self.token = None
         self.advance()
 
     def advance(self):
-        self.pos += 1
-        if self.pos > len(self.tokens) - 1:
-            self.token = None
-            return self.token
-        self.token = self.tokens[self.pos]
+        self.token = next(self.tokens, None)
         return self.token
 
+    def error(self, header : str, cause : str):
+        report(header, cause, self.token.position if self.token else None)
+
     def parse(self):
         return self.script()
 
     def script(self):
-        sts = [self.statement()]
+        return ScriptNode(list(self.statements()))
+
+    def statements(self):
+        yield self.statement()
         while self.token.type == TT_SEMICOLON:
             self.advance()
-            print(self.token)
             if self.token.type == TT_EOF:
-                break
-            sts.append(self.statement())
+                return
+            yield self.statement()
         if self.token.type != TT_EOF:
-            report("SyntaxException", f"Expected statement / `;`.")
-        return ScriptNode(sts)
+            self.error("SyntaxException", f"Expected statement / `;`.")
 
     def statement(self):
+        position = self.token.position
         if self.token.type == TT_KEYWORD:
             if self.token.value == "log":
                 pass
 
-        return self.afterscript(self.logic())
-
-    def factor(self):
-        if self.token.type in (TT_INT, TT_FLOAT):
-            token = self.token
-            self.advance()
-            return self.afterscript(NumberNode(token))
+        node = self.expression(LEVEL_LOGIC, True)
+        node.position = position
+        return node
 
-        elif self.token.type == TT_STRING:
-            token = self.token
-            self.advance()
-            return self.afterscript(StringNode(token))
+    # Parses an expression of the given precedence level, followed by its      #
+    # postfix attributes, calls and indexes when `postfix` is set. Pending work #
+    # lives on an explicit stack of frames instead of the Python call stack,   #
+    # so the nesting depth of the source is only bounded by memory.            #
+    def expression(self, level : int, postfix : bool = False) -> Node:
+        frames = [(FRAME_POSTFIX,)] if postfix else []
+        node = None
+        descend = level
 
-        elif self.token.type == TT_NOT:
-            self.advance()
-            return self.afterscript(NegationNode(self.factor()))
+        while True:
+            # Descending: start an operand at level `descend`, which either #
+            # completes as `node` or pushes frames and descends again.      #
+            while descend is not None:
+                if descend < LEVEL_FACTOR:
+                    frames.append((FRAME_OPERAND, descend))
+                node, descend = self.prefix(frames)
+
+            # Ascending: hand the completed `node` to the innermost frame #
+            if not frames:
+                return node
+            frame = frames.pop()
+            kind = frame[0]
+
+            if kind == FRAME_OPERAND or kind == FRAME_OPERATOR:
+                if kind == FRAME_OPERATOR:
+                    node = BinOpNode(frame[2], frame[3], node)
+                lowest = frame[1] if kind == FRAME_OPERAND else frame[4]
+                found = OPERATOR_LEVELS.get(self.token.type)
+                if found is not None and found >= lowest:
+                    op = self.token
+                    self.advance()
+                    frames.append((FRAME_OPERATOR, found, node, op, lowest))
+                    descend = found + 1
 
-        elif self.token.type == TT_BOOLEAN:
-            token = self.token
-            self.advance()
-            return self.afterscript(BooleanNode(token))
+            elif kind == FRAME_POSTFIX:
+                node, descend = self.postfix(node, frames)
 
-        elif self.token.type == TT_LARRAY:
-            self.advance()
+            elif kind == FRAME_NOT:
+                node, descend = self.postfix(NegationNode(node), frames)
 
-            elements = []
-            if self.token.type == TT_RARRAY:
-                self.advance()
-            else:
-                elements.append(self.afterscript(self.logic()))
-                while True:
-                    if self.token.type == TT_RARRAY:
-                        self.advance()
-                        break
+            elif kind == FRAME_ARRAY:
+                elements = frame[1]
+                elements.append(node)
+                if self.token.type == TT_RARRAY:
+                    self.advance()
+                    node, descend = self.postfix(ArrayNode(elements), frames)
+                else:
                     if self.token.type != TT_COMMA:
-                        report("SyntaxException", "Expected `,` between array elements.")
+                        self.error("SyntaxException", "Expected `,` between array elements.")
                     self.advance()
                     if not self.token:
-                        report("SyntaxException", "Expected array elements.")
-                    elements.append(self.afterscript(self.logic()))
-
-            return self.afterscript(ArrayNode(elements))
+                        self.error("SyntaxException", "Expected array elements.")
+                    frames.append(frame)
+                    frames.append((FRAME_POSTFIX,))
+                    descend = LEVEL_LOGIC
+
+            elif kind == FRAME_ABS:
+                if self.token.type != TT_ABS:
+                    self.error("SyntaxError", "Expected `|` as a finish for the Absolute Value Operation.")
+                self.advance()
+                node = AbsoluteNode(node)
 
-        # elif self.token.type == TT_NAMESPACE:
-        #     if self.token.value in ("true", "false"):
-        #         token = self.token
-        #         self.advance()
-        #         return BooleanNode(token)
+            elif kind == FRAME_PAREN:
+                if self.token.type != TT_RPAREN:
+                    self.error("SyntaxError", "Expected `)`.")
+                self.advance()
 
-        #     report("NamespaceException", f"Unknown namespace: `{self.token.value}`.")
+            elif kind == FRAME_ARGS:
+                args = frame[2]
+                args.append(node)
+                if self.token.type == TT_RPAREN:
+                    self.advance()
+                    node, descend = self.postfix(InvokeNode(frame[1], args), frames)
+                else:
+                    if self.token.type != TT_COMMA:
+                        self.error("SyntaxException", "Expected `,` between arguments.")
+                    self.advance()
+                    if not self.token:
+                        self.error("SyntaxException", "Expected arguments.")
+                    frames.append(frame)
+                    frames.append((FRAME_POSTFIX,))
+                    descend = LEVEL_LOGIC
+
+            elif kind == FRAME_INDEX:
+                if self.token.type != TT_RINDEX:
+                    self.error("SyntaxException", "Expected `]`.")
+                self.advance()
+                node, descend = self.postfix(GetIndexNode(frame[1], node), frames)
 
-        elif self.token.type == TT_ABS:
+    # Starts an operand. Returns it with None when it's complete, or None with #
+    # the level to descend into after pushing the frame that completes it.    #
+    def prefix(self, frames : list) -> tuple[Node | None, int | None]:
+        token = self.token
+        if token.type in (TT_INT, TT_FLOAT):
             self.advance()
-            subscript = self.expr()
+            return self.postfix(NumberNode(token), frames)
 
-            if self.token.type != TT_ABS:
-                report("SyntaxError", "Expected `|` as a finish for the Absolute Value Operation.")
+        elif token.type == TT_STRING:
             self.advance()
+            return self.postfix(StringNode(token), frames)
 
-            return AbsoluteNode(subscript)
-
-        elif self.token.type == TT_LPAREN:
+        elif token.type == TT_NOT:
             self.advance()
-            subscript = self.logic()
+            frames.append((FRAME_NOT,))
+            return None, LEVEL_FACTOR
 
-            if self.token.type != TT_RPAREN:
-                report("SyntaxError", "Expected `)`.")
+        elif token.type == TT_BOOLEAN:
             self.advance()
+            return self.postfix(BooleanNode(token), frames)
 
-            return subscript
-
-        report("SyntaxException", "Expected a STRING, BOOLEAN, INT or FLOAT object.")
-
-    def power(self):
-        return self.binOp(self.factor, (TT_POW, TT_TETR))
-    def term(self):
-        return self.binOp(self.power, (TT_MUL, TT_DIV, TT_MOD))
-    def expr(self):
-        return self.binOp(self.term, (TT_PLUS, TT_MINUS))
-    def comp(self):
-        return self.binOp(self.expr, (TT_EQ, TT_NEQ, TT_GT, TT_GTE, TT_LT, TT_LTE))
-    def logic(self):
-        return self.binOp(self.comp, (TT_AND, TT_OR))
+        elif token.type == TT_LARRAY:
+            self.advance()
+            if self.token.type == TT_RARRAY:
+                self.advance()
+                return self.postfix(ArrayNode([]), frames)
+            frames.append((FRAME_ARRAY, []))
+            frames.append((FRAME_POSTFIX,))
+            return None, LEVEL_LOGIC
 
-    def binOp(self, func, ops : list[str]):
-        left = func()
+        elif token.type == TT_ABS:
+            self.advance()
+            frames.append((FRAME_ABS,))
+            return None, LEVEL_EXPR
 
-        # print(self.token.type, "in", ops) #
-        while self.token.type in ops:
-            op = self.token
+        elif token.type == TT_LPAREN:
             self.advance()
-            right = func()
-            left = BinOpNode(left, op, right)
+            frames.append((FRAME_PAREN,))
+            return None, LEVEL_LOGIC
 
-        return left
+        self.error("SyntaxException", "Expected a STRING, BOOLEAN, INT or FLOAT object.")
 
-    def afterscript(self, node : Node):
-        # print(f"AFTERSCRIPT STARTS AT: {self.token}") #
-        if self.token.type == TT_DOT:
-            self.advance()
-            if self.token.type != TT_NAMESPACE:
-                report("SyntaxException", "Expected namespace for the attribute.")
-            attribute = self.token.value
-            self.advance()
-            return self.afterscript(GetAttributeNode(node, attribute))
+    # Applies the attributes, calls and indexes following `node`, returning #
+    # like prefix() once one of them needs an expression parsed.            #
+    def postfix(self, node : Node, frames : list) -> tuple[Node | None, int | None]:
+        while True:
+            if self.token.type == TT_DOT:
+                self.advance()
+                if self.token.type != TT_NAMESPACE:
+                    self.error("SyntaxException", "Expected namespace for the attribute.")
+                attribute = self.token.value
+                self.advance()
+                node = GetAttributeNode(node, attribute)
 
-        if self.token.type == TT_LPAREN:
-            self.advance()
+            elif self.token.type == TT_LPAREN:
+                self.advance()
+                if self.token.type != TT_RPAREN:
+                    frames.append((FRAME_ARGS, node, []))
+                    frames.append((FRAME_POSTFIX,))
+                    return None, LEVEL_LOGIC
+                self.advance()
+                node = InvokeNode(node, [])
 
-            args = []
-            if self.token.type == TT_RPAREN:
+            elif self.token.type == TT_LINDEX:
                 self.advance()
+                frames.append((FRAME_INDEX, node))
+                frames.append((FRAME_POSTFIX,))
+                return None, LEVEL_LOGIC
+
             else:
-                args.append(self.afterscript(self.logic()))
-                while True:
-                    if self.token.type == TT_RPAREN:
-                        self.advance()
-                        break
-                    if self.token.type != TT_COMMA:
-                        report("SyntaxException", "Expected `,` between arguments.")
-                    self.advance()
-                    if not self.token:
-                        report("SyntaxException", "Expected arguments.")
-                    args.append(self.afterscript(self.logic()))
+                return node, None
 
-            return self.afterscript(InvokeNode(node, args))
 
-        if self.token.type == TT_LINDEX:
-            self.advance()
 
-            index = self.afterscript(self.logic())
-            if self.token.type != TT_RINDEX:
-                report("SyntaxException", "Expected `]`.")
-            self.advance()
+ARITHMETIC_ERRORS = {
+    ZeroDivisionError : "Division by zero.",
+    OverflowError     : "Numerical result out of range.",
+}
 
-            return self.afterscript(GetIndexNode(node, index))
+# Gives an error raised while evaluating a statement the statement's position #
+# when it doesn't have one, turning Python's arithmetic errors into Maple's.  #
+def located(error : Exception, position : int | None) -> MapleError:
+    if not isinstance(error, MapleError):
+        error = MapleArithmeticError(ARITHMETIC_ERRORS.get(type(error), f"{error}."))
+    if error.position is None:
+        error.position = position
+    return error
 
-        return node
 
 
+ASYNC_STEPS = 1000 # nodes evaluated between two yields to the event loop #
 
 class Interpreter:
-    def __init__(self, ast : Node):
+    def __init__(self, ast : Node | None = None):
         self.ast = ast
 
     def run(self):
         return self.visit(self.ast)
 
+    # Evaluates the AST like run(), handing control back to the event loop   #
+    # every `steps` nodes. The run can be cancelled, or given a timeout after #
+    # which asyncio.TimeoutError is raised, between any two nodes.           #
+    async def run_async(self, steps : int = ASYNC_STEPS, timeout : float | None = None):
+        if timeout is not None:
+            return await asyncio.wait_for(self.run_async(steps), timeout)
+
+        statements = self.ast.statements if isinstance(self.ast, ScriptNode) else [self.ast]
+        meter = BUDGET_METER.get()
+        results = []
+        count = 0
+        for statement in statements:
+            walk = self.walk(statement)
+            try:
+                if meter is not None:
+                    meter.charge(tree_size(statement))
+                while True:
+                    next(walk)
+                    count += 1
+                    if count >= steps:
+                        count = 0
+                        await asyncio.sleep(0)
+                        if meter is not None:
+                            meter.check()
+            except StopIteration as finished:
+                results.append(finished.value)
+            except (MapleError, ArithmeticError) as error:
+                raise located(error, statement.position)
+        return results if isinstance(self.ast, ScriptNode) else results[0]
+
+    # Evaluates a statement one node at a time, children first, pausing after #
+    # every node. Each node goes through its usual visit method, on a copy of #
+    # the interpreter whose `visit` hands back the children's values.        #
+    def walk(self, root : Node):
+        values = {}
+        evaluator = copy.copy(self)
+        evaluator.visit = values.pop
+
+        for node, _ in postorder(root):
+            values[node] = getattr(evaluator, f"visit_{type(node).__name__}", evaluator.visit_error)(node)
+            yield
+        return values.pop(root)
+
+    # Statements are evaluated through postvisit, so deeply nested source #
+    # doesn't run into Python's recursion limit.                        #
     def visit(self, node : Node):
-        func = getattr(self, f"visit_{type(node).__name__}", self.visit_error)
-        return func(node)
+        if isinstance(node, ScriptNode):
+            return self.visit_ScriptNode(node)
+        return postvisit(self, node, self.visit_error)
 
     def visit_error(self, node : Node):
         report("DeveloperFailureException", f"No visit method defined for `{type(node).__name__}`-type node.")
 
+    # Statements are charged to the run's budget, if any, before they run #
+    def execute(self, statements : Iterable[Node]):
+        meter = BUDGET_METER.get()
+        for statement in statements:
+            try:
+                if meter is not None:
+                    meter.charge(tree_size(statement))
+                value = self.visit(statement)
+            except (MapleError, ArithmeticError) as error:
+                raise located(error, statement.position)
+            yield value
+
     def visit_ScriptNode(self, node : ScriptNode):
-        results = []
-        for statement in node.statements:
-            results.append(self.visit(statement))
-        return results
+        return list(self.execute(node.statements))
 
     def visit_NumberNode(self, node : NumberNode):
-        if node.token.type == TT_INT:
-            return MapleINT(node.token.value)
-        elif node.token.type == TT_FLOAT:
-            return MapleFLOAT(node.token.value)
+        return literal(node)
 
     def visit_StringNode(self, node : StringNode):
-        return MapleSTRING(node.token.value)
+        return literal(node)
 
     def visit_BooleanNode(self, node : BooleanNode):
-        return MapleBOOLEAN(True if node.token.value == "true" else False)
+        return literal(node)
 
     def visit_ArrayNode(self, node : ArrayNode):
         elements = []
         for e in node.elements:
             elements.append(self.visit(e))
-        return MapleARRAY(elements)
+        return MapleARRAY.of(elements)
 
     def visit_BinOpNode(self, node : BinOpNode):
         left : MapleType = self.visit(node.left)
         right : MapleType = self.visit(node.right)
 
-        if node.op.type == TT_PLUS:
-            return left.op_plus(right)
-        elif node.op.type == TT_MINUS:
-            return left.op_minus(right)
-        elif node.op.type == TT_MUL:
-            return left.op_mul(right)
-        elif node.op.type == TT_POW:
-            return left.op_pow(right)
-        elif node.op.type == TT_DIV:
-            return left.op_div(right)
-        elif node.op.type == TT_MOD:
-            return left.op_mod(right)
-        elif node.op.type == TT_TETR:
-            return left.op_tetr(right)
-        elif node.op.type == TT_AND:
-            return left.op_compare_and(right)
-        elif node.op.type == TT_OR:
-            return left.op_compare_or(right)
-        elif node.op.type == TT_EQ:
-            return left.op_compare_eq(right)
-        elif node.op.type == TT_NEQ:
-            return left.op_compare_neq(right)
-        elif node.op.type == TT_GT:
-            return left.op_compare_gt(right)
-        elif node.op.type == TT_GTE:
-            return left.op_compare_gte(right)
-        elif node.op.type == TT_LT:
-            return left.op_compare_lt(right)
-        elif node.op.type == TT_LTE:
-            return left.op_compare_lte(right)
+        operation = BINARY_OPERATIONS.get(node.op.type)
+        if operation:
+            return dispatch(operation, left, right)
 
     def visit_NegationNode(self, node : NegationNode):
         subscript : MapleType = self.visit(node.node)
@@ -625,25 +1068,16 @@ class Interpreter:
 
     def visit_AbsoluteNode(self, node : AbsoluteNode):
         subscript : MapleType = self.visit(node.node)
-        if isinstance(subscript, MapleINT):
-            return MapleINT(abs(subscript.value))
-        if isinstance(subscript, MapleFLOAT):
-            return MapleFLOAT(abs(subscript.value))
-        report("TypeException", f"{subscript.regname}-type object doesn't have an Absolute Value.")
+        return subscript.op_abs()
 
     def visit_GetAttributeNode(self, node : GetAttributeNode):
         parent : MapleType = self.visit(node.node)
-        attribute : MapleType | None = parent.storage.get(node.attribute)
-        if not attribute:
-            report("AttributeException", f"This {parent.regname}-type object doesn't have a `{node.attribute}` attribute.")
-        return attribute
+        return parent.op_getattr(node.attribute)
 
     def visit_SetAttributeNode(self, node : SetAttributeNode):
         parent : MapleType = self.visit(node.node)
         value : MapleType | None = self.visit(node.value)
-        if not value:
-            report("TypeException", "Assignation Operation's value mustn't be nullable.")
-        parent.storage[node.attribute] = value
+        parent.op_setattr(node.attribute, value)
 
     def visit_GetIndexNode(self, node : GetIndexNode):
         parent : MapleType = self.visit(node.node)
@@ -652,4 +1086,5 @@ class Interpreter:
 
     def visit_InvokeNode(self, node : InvokeNode):
         parent : MapleType = self.visit(node.node)
-        return parent.op_invoke(node.args)
\ No newline at end of file
+        args = [self.visit(arg) for arg in node.args]
+        return parent.op_invoke(args)
\ No newline at end of file
@@ -0,0 +1,76 @@
+from maple import *
+from contextlib import contextmanager
+
+# Counts of the Maple objects created while tracking: instances per type,   #
+# method wrappers, the most objects created meanwhile alive at once, and the #
+# bit length of the largest integer held by any of them.                    #
+class AllocationStats:
+    def __init__(self):
+        self.created : dict[str, int] = {}
+        self.live : set[int] = set()
+        self.peak_live = 0
+        self.largest_bits = 0
+
+    @property
+    def wrappers(self) -> int:
+        return self.created.get(MapleMETHOD.regname, 0)
+
+    @property
+    def total(self) -> int:
+        return sum(self.created.values())
+
+    def to_json(self) -> dict:
+        return {
+            "created" : dict(sorted(self.created.items(), key=lambda item: -item[1])),
+            "total" : self.total,
+            "wrappers" : self.wrappers,
+            "peak_live" : self.peak_live,
+            "largest_bits" : self.largest_bits,
+        }
+
+    def format(self) -> str:
+        lines = ["Maple objects created:"]
+        for regname, count in sorted(self.created.items(), key=lambda item: -item[1]):
+            lines.append(f"  {regname:<10} {count:>12}")
+        lines.append(f"  {'total':<10} {self.total:>12}")
+        lines.append(f"Method wrappers: {self.wrappers}")
+        lines.append(f"Peak live objects: {self.peak_live}")
+        lines.append(f"Largest integer: {self.largest_bits} bits")
+        return "\n".join(lines)
+
+# Counts every Maple object created inside the block into the yielded stats. #
+# MapleType's constructor is only swapped for a counting one meanwhile, so   #
+# nothing is paid outside of it; the counting is process-wide, so blocks     #
+# shouldn't overlap between threads.                                         #
+@contextmanager
+def track_allocations(stats : AllocationStats | None = None):
+    stats = stats if stats is not None else AllocationStats()
+    created, live = stats.created, stats.live
+    construct = MapleType.__init__
+
+    def counting_init(self, value):
+        construct(self, value)
+        regname = self.regname
+        created[regname] = created.get(regname, 0) + 1
+        if type(value) is int:
+            bits = value.bit_length()
+            if bits > stats.largest_bits:
+                stats.largest_bits = bits
+        live.add(id(self))
+        if len(live) > stats.peak_live:
+            stats.peak_live = len(live)
+
+    def counting_del(self):
+        live.discard(id(self))
+
+    MapleType.__init__ = counting_init
+    MapleType.__del__ = counting_del
+    try:
+        yield stats
+    finally:
+        MapleType.__init__ = construct
+        del MapleType.__del__
+        live.clear()
+
+def write_stats(stats : AllocationStats):
+    print(stats.format(), file=sys.stderr)
@@ -0,0 +1,50 @@
+from maple import *
+from concurrent.futures import ThreadPoolExecutor
+import argparse, time
+
+STRESS_SCRIPT = """
+1 + 2 * 3 - 4 / 2;
+(2 ** 64 + 1) % 97;
+!20 - !19;
+3 *** 3;
+|-7.5| * 2;
+"thread" + "-" + "safe";
+1.5.ratio()[0] + 1.5.ratio()[1];
+{1, 2.5, "x", true}[2];
+1 < 2 && 2 >= 2 || false;
+5.__class__;
+"""
+
+# Runs one shared program from many threads at once and checks every run #
+# gives the results of a run made alone. Returns the number of mismatches. #
+def stress(program : Program, threads : int = 32, runs : int = 2000) -> int:
+    expected = [represent(value) for value in program.run()]
+
+    def run(_) -> bool:
+        return [represent(value) for value in program.run()] == expected
+
+    with ThreadPoolExecutor(threads) as pool:
+        return sum(not matched for matched in pool.map(run, range(runs)))
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(prog="maple-stress")
+    cli.add_argument("path", nargs="?", help="MAPLe script to share between the threads (default: a built-in script)")
+    cli.add_argument("--engine", choices=ENGINES + ("all",), default="all", help="engine the shared program is prepared for")
+    cli.add_argument("--threads", type=int, default=32, help="threads running the program at once")
+    cli.add_argument("--runs", type=int, default=2000, help="runs spread over the threads")
+    args = cli.parse_args()
+
+    source = STRESS_SCRIPT
+    if args.path:
+        with open(args.path, encoding="utf-8") as script:
+            source = script.read()
+
+    failed = False
+    for engine in ENGINES if args.engine == "all" else (args.engine,):
+        program = Program(parse(source), engine)
+        start = time.perf_counter()
+        mismatches = stress(program, args.threads, args.runs)
+        elapsed = time.perf_counter() - start
+        print(f"{engine:<8} {args.runs} runs on {args.threads} threads in {elapsed:.3f}s, {mismatches} mismatches")
+        failed = failed or mismatches > 0
+    sys.exit(1 if failed else 0)
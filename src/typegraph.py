@@ -1,24 +1,585 @@
-import sys, os
-
-def report(header : str, cause : str):
-    print(f"Fatal exception reported:\n {header} : {cause}")
-    sys.exit(-1)
+import sys, os, math, time, operator, contextvars, decimal, random, functools
+from contextlib import contextmanager
+
+class MapleError(Exception):
+    kind : str = "Exception"
+
+    def __init__(self, message : str, position : int | None = None, kind : str | None = None):
+        super().__init__(message)
+        self.message = message
+        self.position = position # offset of the failing token or statement in the source #
+        if kind:
+            self.kind = kind
+
+    def __reduce__(self):
+        return (type(self), (self.message, self.position, self.kind))
+
+    def __str__(self) -> str:
+        return f"{self.kind} : {self.message}"
+
+    def report(self) -> str:
+        return f"Fatal exception reported:\n {self}"
+
+    # 1-based line and column of the error in `source` #
+    def location(self, source : str | bytes) -> tuple[int, int] | None:
+        if self.position is None:
+            return None
+        newline = "\n" if isinstance(source, str) else b"\n"
+        line = source.count(newline, 0, self.position) + 1
+        column = self.position - (source.rfind(newline, 0, self.position) + 1) + 1
+        return line, column
+
+class MapleSyntaxError(MapleError):
+    kind = "SyntaxException"
+
+class MapleNamespaceError(MapleError):
+    kind = "NamespaceException"
+
+class MapleTypeError(MapleError):
+    kind = "TypeException"
+
+class MapleAttributeError(MapleError):
+    kind = "AttributeException"
+
+class MapleArgumentError(MapleError):
+    kind = "ArgumentException"
+
+class MapleIndexError(MapleError):
+    kind = "IndexException"
+
+class MapleInvokeError(MapleError):
+    kind = "InvokeException"
+
+class MapleConstructionError(MapleError):
+    kind = "ConstructionException"
+
+class MapleArithmeticError(MapleError):
+    kind = "ArithmeticException"
+
+class MapleDeveloperError(MapleError):
+    kind = "DeveloperFailureException"
+
+class MapleBudgetError(MapleError):
+    kind = "BudgetException"
+
+ERRORS = {
+    "SyntaxError"               : MapleSyntaxError,
+    "SyntaxException"           : MapleSyntaxError,
+    "NamespaceException"        : MapleNamespaceError,
+    "TypeException"             : MapleTypeError,
+    "AttributeException"        : MapleAttributeError,
+    "ArgumentException"         : MapleArgumentError,
+    "IndexException"            : MapleIndexError,
+    "InvokeException"           : MapleInvokeError,
+    "ConstructionException"     : MapleConstructionError,
+    "ArithmeticException"       : MapleArithmeticError,
+    "DeveloperFailureException" : MapleDeveloperError,
+    "BudgetException"           : MapleBudgetError,
+}
+
+def report(header : str, cause : str, position : int | None = None):
+    raise ERRORS.get(header, MapleError)(cause, position, header)
+
+# Results estimated at fewer bits than this are never checked against a #
+# budget, so everyday arithmetic doesn't pay for it.                     #
+BUDGET_FREE_BITS = 1024
+
+# Estimated bytes of an ARRAY with its empty list, and of each element slot #
+ARRAY_BYTES = 104
+POINTER_BYTES = 8
+BUDGET_CHECK_INTERVAL = 4096 # loop iterations between two deadline checks #
+
+# Limits of a single run: evaluated nodes, wall-clock seconds, bits of any #
+# integer result, and estimated bytes of the large integers and strings,   #
+# and of every array, produced in total. None leaves a resource unlimited. #
+# Budgets only hold limits, so one may be shared by any number of runs and #
+# threads.                                                                 #
+class Budget:
+    def __init__(self, steps : int | None = None, seconds : float | None = None, bits : int | None = None, memory : int | None = None):
+        self.steps = steps
+        self.seconds = seconds
+        self.bits = bits
+        self.memory = memory
+
+    def __repr__(self) -> str:
+        return f"<budget steps={self.steps} seconds={self.seconds} bits={self.bits} memory={self.memory}>"
+
+# What a run spent so far of its budget. A `deadline` on the monotonic #
+# clock replaces the one counted from now, for runs split in parts.    #
+class BudgetMeter:
+    def __init__(self, budget : Budget, deadline : float | None = None):
+        self.budget = budget
+        self.steps = 0
+        self.memory = 0
+        if deadline is None and budget.seconds is not None:
+            deadline = time.monotonic() + budget.seconds
+        self.deadline = deadline
+
+    def charge(self, steps : int):
+        self.steps += steps
+        if self.budget.steps is not None and self.steps > self.budget.steps:
+            report("BudgetException", f"Evaluation exceeded its budget of {self.budget.steps} steps.")
+        self.check()
+
+    def check(self):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            report("BudgetException", f"Evaluation exceeded its budget of {self.budget.seconds} seconds.")
+
+    # Called before a result estimated at `bits` bits is computed #
+    def afford(self, bits : int | float, integer : bool = True):
+        if integer and self.budget.bits is not None and bits > self.budget.bits:
+            size = f"about {int(bits)} bits" if math.isfinite(bits) else "too many bits to estimate"
+            report("BudgetException", f"Result of {size} exceeds the budget of {self.budget.bits} bits.")
+        self.spend(int(bits) // 8 if math.isfinite(bits) else math.inf)
+        self.check()
+
+    def spend(self, memory : int | float):
+        self.memory += memory
+        if self.budget.memory is not None and self.memory > self.budget.memory:
+            report("BudgetException", f"Evaluation exceeded its budget of {self.budget.memory} bytes.")
+
+BUDGET_METER : contextvars.ContextVar[BudgetMeter | None] = contextvars.ContextVar("BUDGET_METER", default=None)
+
+# Runs the block under a fresh meter of `budget`; no budget means no limits #
+@contextmanager
+def limited(budget : Budget | None, deadline : float | None = None):
+    if budget is None:
+        yield None
+        return
+    meter = BudgetMeter(budget, deadline)
+    token = BUDGET_METER.set(meter)
+    try:
+        yield meter
+    finally:
+        BUDGET_METER.reset(token)
+
+def afford(bits : int | float, integer : bool = True):
+    meter = BUDGET_METER.get()
+    if meter is not None:
+        meter.afford(bits, integer)
+
+def checkpoint():
+    meter = BUDGET_METER.get()
+    if meter is not None:
+        meter.check()
+
+# Estimated bits of base ** exponent for integers, before computing it #
+def power_bits(base : int, exponent : int) -> float:
+    if type(base) is not int or type(exponent) is not int or exponent <= 0 or -1 <= base <= 1:
+        return 1
+    if exponent.bit_length() > 1000:
+        return math.inf
+    return exponent * math.log2(abs(base))
+
+# base ** exponent for a FLOAT result, overflowing to an infinity like the #
+# other float operations instead of raising OverflowError.                  #
+def float_power(base, exponent):
+    try:
+        return base ** exponent
+    except OverflowError:
+        base, exponent = float(base), float(exponent) # operands too large for floats still raise #
+        if base < 0 and exponent.is_integer() and exponent % 2 == 1:
+            return -math.inf
+        return math.inf
+
+# Top of a tower of `height` powers of `base`, each computed with `power`. #
+# A tower settling on one value, or alternating between two as with bases  #
+# 0, 1 and -1, is known from there on and isn't computed any further.      #
+def tower(base, height : int, power):
+    result = 1
+    previous = None
+    for i in range(height):
+        bits = power_bits(base, result)
+        if bits > BUDGET_FREE_BITS:
+            afford(bits)
+        elif not i % BUDGET_CHECK_INTERVAL:
+            checkpoint()
+
+        following = power(base, result)
+        if type(following) is type(result) and following == result:
+            return result
+        if type(following) is type(previous) and following == previous:
+            return following if (height - i - 1) % 2 == 0 else result
+        previous, result = result, following
+    return result
+
+# Estimated bits of n! from Stirling's approximation, before computing it #
+def factorial_bits(n : int) -> float:
+    if type(n) is not int or n < 2:
+        return 1
+    if n.bit_length() > 1000:
+        return math.inf
+    return math.lgamma(n + 1) / math.log(2)
+
+# Towers of positive integer bases past this many bits are kept lazy as #
+# TOWER objects, and only computed for operations they don't implement, #
+# up to TOWER_MATERIAL_BITS bits; their iterated logarithms carry       #
+# TOWER_DIGITS digits.                                                  #
+TOWER_BITS = 1 << 20
+TOWER_MATERIAL_BITS = 1 << 32
+TOWER_DIGITS = 360
+TOWER_LEVELS = 4 # "10^" prefixes written out before they're counted #
+TOWER_CONTEXT = decimal.Context(prec=TOWER_DIGITS)
+TOWER_LOG_CONTEXT = decimal.Context(prec=64) # for logarithms of logarithms, far below 2 ** 2 ** 1000 #
+TOWER_MARGIN = decimal.Decimal("1e-40") # closer logarithms are told apart exactly #
+TOWER_RADIXES = {radix : TOWER_CONTEXT.ln(radix) for radix in (2, 10)}
+
+# Top of a tower of `height` powers of an integer `base` of at least 2, or #
+# None when it would take more than `bits` bits. A level is not computed  #
+# when the one above it, of at least 2 ** (size - 2) bits, can't fit.      #
+def tower_exponent(base : int, height : int, bits : int | float) -> int | None:
+    result = 1
+    for i in range(height):
+        size = power_bits(base, result)
+        if size > bits or i + 1 < height and size - 2 > math.log2(bits):
+            return None
+        if size > BUDGET_FREE_BITS:
+            afford(size)
+        result = base ** result
+    return result
+
+# Logarithm in base `radix` of a positive integer or Decimal #
+def decimal_log(n : int | decimal.Decimal, radix : int) -> decimal.Decimal:
+    if type(n) is not int:
+        return TOWER_LOG_CONTEXT.divide(TOWER_LOG_CONTEXT.ln(n), TOWER_RADIXES[radix])
+    context = TOWER_CONTEXT
+    power = round(math.log(n, radix))
+    if n % radix == 0 and radix ** power == n:
+        return decimal.Decimal(power)
+    shift = max(n.bit_length() - 4 * TOWER_DIGITS, 0)
+    logarithm = context.add(context.ln(decimal.Decimal(n >> shift)), context.multiply(shift, TOWER_RADIXES[2]))
+    return context.divide(logarithm, TOWER_RADIXES[radix])
+
+# The tower of `height` powers of `base` as (k, x), x being its logarithm  #
+# in base `radix` taken k times: the lowest levels are computed exactly   #
+# while they fit in a float, and every level above only adds log(log(a)). #
+@functools.lru_cache(maxsize=256)
+def tower_logs(base : int, height : int, radix : int = 2) -> tuple[int, decimal.Decimal]:
+    exponent, level = 1, 0
+    while level < height - 1 and power_bits(base, exponent) <= 1000:
+        exponent, level = base ** exponent, level + 1
+    context = TOWER_CONTEXT
+    scale = decimal_log(base, radix)
+    logarithm = context.multiply(exponent, scale)
+    if height - level > 1:
+        logarithm = context.add(logarithm, decimal_log(scale, radix))
+    return height - level, logarithm
+
+# Sign of the tower of `height` powers of `base` minus `other`, an int, a #
+# float or another tower as (base, height); None when unordered (NaN).   #
+def tower_compare(base : int, height : int, other) -> int | None:
+    if type(other) is float:
+        if math.isnan(other):
+            return None
+        return -1 if other == math.inf else 1
+    if type(other) is int:
+        k, x = tower_logs(base, height)
+        if k > 1 or other <= 1:
+            return 1 # past 2 ** 2 ** 1000, beyond any INT #
+        y = decimal_log(other, 2)
+        if abs(x - y) > TOWER_MARGIN:
+            return 1 if x > y else -1
+        exponent = tower_exponent(base, height - 1, math.inf)
+        afford(power_bits(base, exponent))
+        value = base ** exponent
+        return (value > other) - (value < other)
+    if (base, height) == other:
+        return 0
+    (k, x), (l, y) = tower_logs(base, height), tower_logs(*other)
+    sign = 1
+    if k > l:
+        (k, x), (l, y), sign = (l, y), (k, x), -1
+    for _ in range(l - k):
+        if x <= 1:
+            return -sign
+        x = decimal_log(x, 2)
+    if abs(x - y) <= TOWER_MARGIN:
+        return 0
+    return sign if x > y else -sign
+
+# Number of decimal digits of a tower, when it can be held by an INT #
+def tower_digits(base : int, height : int) -> int | None:
+    k, x = tower_logs(base, height, 10)
+    if k > 1:
+        return None
+    return int(x.to_integral_value(decimal.ROUND_FLOOR)) + 1 # powers of 10 get an exact logarithm #
+
+# Number of decimal digits of an integer, counted without printing it #
+def int_digits(n : int) -> int:
+    n = abs(n)
+    if n < 10:
+        return 1
+    digits = int(decimal_log(n, 10).to_integral_value(decimal.ROUND_FLOOR)) + 1
+    if n < 10 ** (digits - 1):
+        return digits - 1
+    if n >= 10 ** digits:
+        return digits + 1
+    return digits
+
+# 10 ** logarithm as "m.mmmmmme+N" #
+def scientific(logarithm : decimal.Decimal) -> str:
+    exponent = logarithm.to_integral_value(decimal.ROUND_FLOOR)
+    mantissa = f"{TOWER_CONTEXT.power(10, TOWER_CONTEXT.subtract(logarithm, exponent)):.6f}"
+    exponent = int(exponent)
+    if mantissa.startswith("10"):
+        mantissa, exponent = "1.000000", exponent + 1
+    return f"{mantissa}e+{exponent}"
+
+PRIME_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+PRIME_BASES_BOUND = 3317044064679887385961981 # least strong pseudoprime to all of them #
+
+# Miller-Rabin test with PRIME_BASES, deterministic below PRIME_BASES_BOUND. #
+# Past it, a strong Lucas test completes the Baillie-PSW test, which has no #
+# known counterexample.                                                     #
+def is_prime(n : int) -> bool:
+    if n < 2:
+        return False
+    for p in PRIME_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while not d & 1:
+        d, s = d >> 1, s + 1
+    for a in PRIME_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return n < PRIME_BASES_BOUND or is_lucas_prime(n)
+
+# Jacobi symbol (a/n) for an odd positive n #
+def jacobi(a : int, n : int) -> int:
+    a %= n
+    result = 1
+    while a:
+        while not a & 1:
+            a >>= 1
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+# Strong Lucas probable prime test of an odd n > 41, with Selfridge's parameters #
+def is_lucas_prime(n : int) -> bool:
+    if math.isqrt(n) ** 2 == n:
+        return False # no D below would ever be found #
+    D = 5
+    while (symbol := jacobi(D, n)) != -1:
+        if symbol == 0:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    d, s = n + 1, 0
+    while not d & 1:
+        d, s = d >> 1, s + 1
+
+    def halved(x : int) -> int:
+        x %= n
+        return (x + n if x & 1 else x) >> 1
+
+    U, V, Qk = 1, P, Q % n # U(1), V(1) and Q ** 1 #
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == "1":
+            U, V, Qk = halved(P * U + V), halved(D * U + P * V), Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+# A non-trivial factor of a composite n, from Pollard's rho with Brent's cycle detection #
+def pollard_rho(n : int) -> int:
+    if n % 2 == 0:
+        return 2
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                checkpoint()
+                saved = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                saved = (saved * saved + c) % n
+                g = math.gcd(abs(x - saved), n)
+        if g != n:
+            return g
+
+# Prime factors of n with their multiplicities #
+def factorize(n : int) -> dict[int, int]:
+    factors = {}
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    pending = [n] if n > 1 else []
+    while pending:
+        n = pending.pop()
+        if is_prime(n):
+            factors[n] = factors.get(n, 0) + 1
+        else:
+            factor = pollard_rho(n)
+            pending += [factor, n // factor]
+    return factors
+
+def totient(n : int) -> int:
+    result = n
+    for p in factorize(n):
+        result = result // p * (p - 1)
+    return result
+
+# The tower of `height` powers of `base` modulo a positive `modulus`. Past a #
+# few levels an exponent only matters modulo the totient of the modulus:   #
+# a ** e = a ** (e % phi(m) + phi(m)) (mod m) as soon as e >= log2(m).       #
+def tower_mod(base : int, height : int, modulus : int) -> int:
+    chain = []
+    while True:
+        if modulus == 1 or height <= 0:
+            result = 1 % modulus
+            break
+        exponent = tower_exponent(base, height - 1, modulus.bit_length() + 64)
+        if exponent is not None:
+            result = pow(base, exponent, modulus)
+            break
+        phi = totient(modulus)
+        chain.append((modulus, phi))
+        modulus, height = phi, height - 1
+    for modulus, phi in reversed(chain):
+        result = pow(base, result + phi, modulus)
+    return result
+
+def represent(value) -> str:
+    if isinstance(value, MapleType):
+        return value.op_represent()
+    return f"{value}"
+
+# Text of `root` with every ARRAY in it spelled out between `opening` and #
+# `closing` around its elements, and anything else as `text` gives it.    #
+# Walks the arrays without recursing, so any nesting can be printed.      #
+def spelled(root, text, opening : str, closing : str) -> str:
+    parts = []
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            parts.append(item)
+        elif type(item) is MapleARRAY:
+            stack.append(closing)
+            for i in range(len(item.value) - 1, -1, -1):
+                stack.append(item.value[i])
+                if i:
+                    stack.append(", ")
+            stack.append(opening)
+        else:
+            parts.append(text(item))
+    return "".join(parts)
+
+# Binary operation kernels keyed by (operation, left type, right type). Pairs #
+# without a kernel fall back to the left operand's op_* method, which only   #
+# reports the TypeException (or answers equality checks with false): the    #
+# op_* methods themselves go through these kernels.                          #
+KERNELS : dict = {}
+RESULTS : dict = {}
+
+def register(operation : str, left : type, right : type, result : type | None = None):
+    def decorator(kernel):
+        KERNELS[(operation, left, right)] = kernel
+        RESULTS[(operation, left, right)] = result
+        return kernel
+    return decorator
+
+def dispatch(operation : str, left, right):
+    kernel = KERNELS.get((operation, type(left), type(right)))
+    if kernel:
+        return kernel(left, right)
+    return getattr(left, operation)(right)
+
+# INT, FLOAT, STRING and BOOLEAN values are immutable: operations always #
+# return new objects and attributes can't be written to them, so a single #
+# instance may be shared between literals, operators and interned caches. #
+# ARRAY and METHOD objects are mutable and are never shared.              #
+
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+FACTORIAL_TABLE = 256 # factorials of smaller INTs are computed once and shared #
 
 class MapleType:
-    def __init__(self, value):
-        self.regname = "UNKNOWN"
-        self.value = value
-        self.storage = {}
+    __slots__ = ("value", "storage")
+
+    regname : str = "UNKNOWN"
+    methods : dict = {}
+    immutable : bool = False
 
-        self.storage["__class__"] = type(self)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Method tables are built once per class, wrappers are bound on lookup #
+        cls.methods = {fn.removeprefix("method_") : getattr(cls, fn) for fn in dir(cls) if fn.startswith("method_")}
 
-        for fn in dir(self):
-            if fn.startswith("method_"):
-                self.storage[fn.removeprefix("method_")] = MapleMETHOD(getattr(self, fn))
+    def __init__(self, value):
+        self.value = value
+        self.storage = None
 
     def __repr__(self):
         return f"{self.regname}({self.value})"
 
+    def getattribute(self, name : str):
+        if self.storage and name in self.storage:
+            return self.storage[name]
+        if name == "__class__":
+            return type(self)
+        method = self.methods.get(name)
+        if method:
+            return MapleMETHOD(method.__get__(self))
+        return None
+
+    def op_getattr(self, name : str):
+        attribute = self.getattribute(name)
+        if not attribute:
+            report("AttributeException", f"This {self.regname}-type object doesn't have a `{name}` attribute.")
+        return attribute
+
+    def op_setattr(self, name : str, value):
+        if not value:
+            report("TypeException", "Assignation Operation's value mustn't be nullable.")
+        self.setattribute(name, value)
+
+    def setattribute(self, name : str, value):
+        if self.immutable:
+            report("AttributeException", f"{self.regname}-type objects are immutable.")
+        if self.storage is None:
+            self.storage = {}
+        self.storage[name] = value
+
+    # Applies the kernel registered for `operation` on both operands' types, #
+    # reporting `failure` as a TypeException for pairs without one.          #
+    def apply(self, operation : str, other, failure : str):
+        kernel = KERNELS.get((operation, type(self), type(other)))
+        if kernel is None:
+            report("TypeException", failure)
+        return kernel(self, other)
+
     def op_plus(self, other):
         if not isinstance(other, MapleType):
             report("DeveloperFailureException", f"`{other}` is not a MapleType-MRO instance object.")
@@ -97,6 +658,9 @@ class MapleType:
             report("DeveloperFailureException", f"`{other}` is not a MapleType-MRO instance object.")
         report("TypeException", f"{self.regname} and {other.regname} can't be compared together.")
 
+    def op_abs(self):
+        report("TypeException", f"{self.regname}-type object doesn't have an Absolute Value.")
+
     def op_invoke(self, args : list):
         report("InvokeException", f"A {self.regname}-type object can't be invoked.")
 
@@ -110,9 +674,9 @@ class MapleType:
         return f"<{self.regname}-type object>"
 
 class MapleMETHOD(MapleType):
-    def __init__(self, value):
-        super().__init__(value)
-        self.regname = "METHOD"
+    __slots__ = ()
+
+    regname = "METHOD"
 
     def op_invoke(self, args : list):
         for arg in args:
@@ -121,9 +685,9 @@ class MapleMETHOD(MapleType):
         return self.value(args)
 
 class MapleCLASS(MapleType):
-    def __init__(self, value):
-        super().__init__(value)
-        self.regname = "CLASS"
+    __slots__ = ()
+
+    regname = "CLASS"
 
     def op_invoke(self, args : list):
         for arg in args:
@@ -132,47 +696,34 @@ class MapleCLASS(MapleType):
         return self.value.op_constructor(self.value, args)
 
 class MapleFLOAT(MapleType):
-    def __init__(self, value : float):
-        super().__init__(value)
-        self.regname = "FLOAT"
+    __slots__ = ()
+
+    regname = "FLOAT"
+    immutable = True
 
     def op_plus(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support PLUS operations together.")
-        return MapleFLOAT(self.value + other.value)
+        return self.apply("op_plus", other, f"{self.regname} and {other.regname} don't support PLUS operations together.")
 
     def op_minus(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support MINUS operations together.")
-        return MapleFLOAT(self.value - other.value)
+        return self.apply("op_minus", other, f"{self.regname} and {other.regname} don't support MINUS operations together.")
 
     def op_mul(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support MUL operations together.")
-        return MapleFLOAT(self.value * other.value)
+        return self.apply("op_mul", other, f"{self.regname} and {other.regname} don't support MUL operations together.")
 
     def op_pow(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support POW operations together.")
-        return MapleFLOAT(self.value ** other.value)
+        return self.apply("op_pow", other, f"{self.regname} and {other.regname} don't support POW operations together.")
 
     def op_div(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support DIV operations together.")
-        return MapleFLOAT(self.value / other.value)
+        return self.apply("op_div", other, f"{self.regname} and {other.regname} don't support DIV operations together.")
 
     def op_mod(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support MOD operations together.")
-        return MapleINT(self.value % other.value)
+        return self.apply("op_mod", other, f"{self.regname} and {other.regname} don't support MOD operations together.")
 
     def op_tetr(self, other):
-        if not isinstance(other, (MapleINT)):
-            report("TypeException", f"Expected the TETR operation exponent to be INT-type, got {other.regname}.")
-        result = 1
-        for _ in range(other.value):
-            result = self.value ** result
-        return MapleFLOAT(result)
+        return self.apply("op_tetr", other, f"Expected the TETR operation exponent to be INT-type, got {other.regname}.")
+
+    def op_abs(self):
+        return MapleFLOAT(abs(self.value))
 
     def op_represent(self) -> str:
         return f"{self.value}f"
@@ -180,147 +731,159 @@ class MapleFLOAT(MapleType):
     def method_ratio(self, args : list[MapleType]):
         if len(args) != 0:
             report("ArgumentException", f"Expected 0 arguments, got {len(args)}.")
-        return MapleARRAY([MapleINT(n) for n in self.value.as_integer_ratio()])
+        return MapleARRAY.of([MapleINT.of(n) for n in self.value.as_integer_ratio()])
 
 class MapleINT(MapleType):
-    def __init__(self, value : int):
-        super().__init__(value)
-        self.regname = "INT"
+    __slots__ = ()
+
+    regname = "INT"
+    immutable = True
+
+    def __reduce__(self):
+        return (MapleINT.of, (self.value,))
+
+    @staticmethod
+    def of(value : int):
+        if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+            return SMALL_INTS[value - SMALL_INT_MIN]
+        return MapleINT(value)
 
     def op_plus(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support PLUS operations together.")
-        if isinstance(other, MapleFLOAT):
-            return MapleFLOAT(self.value + other.value)
-        return MapleINT(self.value + other.value)
+        return self.apply("op_plus", other, f"{self.regname} and {other.regname} don't support PLUS operations together.")
 
     def op_minus(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support MINUS operations together.")
-        if isinstance(other, MapleFLOAT):
-            return MapleFLOAT(self.value - other.value)
-        return MapleINT(self.value - other.value)
+        return self.apply("op_minus", other, f"{self.regname} and {other.regname} don't support MINUS operations together.")
 
     def op_mul(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support MUL operations together.")
-        if isinstance(other, MapleFLOAT):
-            return MapleFLOAT(self.value * other.value)
-        return MapleINT(self.value * other.value)
+        return self.apply("op_mul", other, f"{self.regname} and {other.regname} don't support MUL operations together.")
 
     def op_pow(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support POW operations together.")
-        if isinstance(other, MapleFLOAT):
-            return MapleFLOAT(self.value ** other.value)
-        return MapleINT(self.value ** other.value)
+        return self.apply("op_pow", other, f"{self.regname} and {other.regname} don't support POW operations together.")
 
     def op_div(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support DIV operations together.")
-        return MapleFLOAT(self.value / other.value)
+        return self.apply("op_div", other, f"{self.regname} and {other.regname} don't support DIV operations together.")
 
     def op_mod(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support MOD operations together.")
-        return MapleINT(self.value % other.value)
+        return self.apply("op_mod", other, f"{self.regname} and {other.regname} don't support MOD operations together.")
 
     def op_tetr(self, other):
-        if not isinstance(other, (MapleINT)):
-            report("TypeException", f"Expected the TETR operation exponent to be INT-type, got {other.regname}.")
-        result = 1
-        for _ in range(other.value):
-            result = self.value ** result
-        return MapleINT(result)
+        return self.apply("op_tetr", other, f"Expected the TETR operation exponent to be INT-type, got {other.regname}.")
 
     def op_compare_not(self):
         # Calculate Factorial Instead #
-        result = 1
-        for e in range(1, self.value + 1, 1):
-            result *= e
-        return MapleINT(result)
+        n = self.value
+        if type(n) is int and n < FACTORIAL_TABLE:
+            return FACTORIALS[max(n, 0)]
+        bits = factorial_bits(n)
+        if bits > BUDGET_FREE_BITS:
+            afford(bits)
+        return MapleINT.of(math.factorial(n))
+
+    def op_abs(self):
+        return MapleINT.of(abs(self.value))
+
+    def __repr__(self):
+        return f"{self.regname}({self.op_represent()})"
 
+    # Integers with more digits than CPython prints are written in scientific notation #
     def op_represent(self) -> str:
-        return f"{self.value}"
+        try:
+            return f"{self.value}"
+        except ValueError:
+            text = scientific(decimal_log(abs(self.value), 10))
+            return f"-{text}" if self.value < 0 else text
+
+    # INTs share these with TOWERs, as towers only become TOWERs past TOWER_BITS #
+    def method_digits(self, args : list[MapleType]):
+        if len(args) != 0:
+            report("ArgumentException", f"Expected 0 arguments, got {len(args)}.")
+        return MapleINT.of(int_digits(self.value))
+
+    # Logarithm in base 10 #
+    def method_magnitude(self, args : list[MapleType]):
+        if len(args) != 0:
+            report("ArgumentException", f"Expected 0 arguments, got {len(args)}.")
+        if self.value <= 0:
+            report("ArithmeticException", f"Only positive INTs have a magnitude, not {self.op_represent()}.")
+        return MapleFLOAT(float(decimal_log(self.value, 10)))
 
     def op_compare_eq(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            return MapleBOOLEAN(False)
-        return MapleBOOLEAN(self.value == other.value)
+        kernel = KERNELS.get(("op_compare_eq", type(self), type(other)))
+        return kernel(self, other) if kernel else MapleBOOLEAN.of(False)
 
     def op_compare_neq(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            return MapleBOOLEAN(True)
-        return MapleBOOLEAN(self.value != other.value)
+        kernel = KERNELS.get(("op_compare_neq", type(self), type(other)))
+        return kernel(self, other) if kernel else MapleBOOLEAN.of(True)
 
     def op_compare_gt(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} can't be compared together.")
-        return MapleBOOLEAN(self.value > other.value)
+        return self.apply("op_compare_gt", other, f"{self.regname} and {other.regname} can't be compared together.")
 
     def op_compare_gte(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} can't be compared together.")
-        return MapleBOOLEAN(self.value >= other.value)
+        return self.apply("op_compare_gte", other, f"{self.regname} and {other.regname} can't be compared together.")
 
     def op_compare_lt(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} can't be compared together.")
-        return MapleBOOLEAN(self.value < other.value)
+        return self.apply("op_compare_lt", other, f"{self.regname} and {other.regname} can't be compared together.")
 
     def op_compare_lte(self, other):
-        if not isinstance(other, (MapleINT, MapleFLOAT)):
-            report("TypeException", f"{self.regname} and {other.regname} can't be compared together.")
-        return MapleBOOLEAN(self.value <= other.value)
+        return self.apply("op_compare_lte", other, f"{self.regname} and {other.regname} can't be compared together.")
 
 class MapleSTRING(MapleType):
-    def __init__(self, value : str):
-        super().__init__(value)
-        self.regname = "STRING"
+    __slots__ = ()
+
+    regname = "STRING"
+    immutable = True
 
     def op_plus(self, other):
-        if not isinstance(other, (MapleSTRING)):
-            report("TypeException", f"{self.regname} and {other.regname} don't support PLUS operations together.")
-        return MapleSTRING(self.value + other.value)
+        return self.apply("op_plus", other, f"{self.regname} and {other.regname} don't support PLUS operations together.")
 
     def op_compare_eq(self, other):
-        if not isinstance(other, (MapleSTRING)):
-            return MapleBOOLEAN(False)
-        return MapleBOOLEAN(self.value == other.value)
+        kernel = KERNELS.get(("op_compare_eq", type(self), type(other)))
+        return kernel(self, other) if kernel else MapleBOOLEAN.of(False)
 
     def op_compare_neq(self, other):
-        if not isinstance(other, (MapleSTRING)):
-            return MapleBOOLEAN(True)
-        return MapleBOOLEAN(self.value != other.value)
+        kernel = KERNELS.get(("op_compare_neq", type(self), type(other)))
+        return kernel(self, other) if kernel else MapleBOOLEAN.of(True)
 
     def op_represent(self) -> str:
         return f"{self.value}"
 
 class MapleBOOLEAN(MapleType):
-    def __init__(self, value : bool):
-        super().__init__(value)
-        self.regname = "BOOLEAN"
+    __slots__ = ()
+
+    regname = "BOOLEAN"
+    immutable = True
+
+    def __reduce__(self):
+        return (MapleBOOLEAN.of, (self.value,))
+
+    @staticmethod
+    def of(value : bool):
+        return TRUE if value else FALSE
 
     def op_compare_or(self, other):
-        if not isinstance(other, MapleBOOLEAN):
-            report("TypeException", f"{self.regname} and {other.regname} don't support logical alternative operations together.")
-        return MapleBOOLEAN(self.value or other.value)
+        return self.apply("op_compare_or", other, f"{self.regname} and {other.regname} don't support logical alternative operations together.")
 
     def op_compare_and(self, other):
-        if not isinstance(other, MapleBOOLEAN):
-            report("TypeException", f"{self.regname} and {other.regname} don't support logical conjuction operations together.")
-        return MapleBOOLEAN(self.value and other.value)
+        return self.apply("op_compare_and", other, f"{self.regname} and {other.regname} don't support logical conjuction operations together.")
 
     def op_compare_not(self):
-        return MapleBOOLEAN(not self.value)
+        return MapleBOOLEAN.of(not self.value)
 
     def op_represent(self) -> str:
         return "true" if self.value else "false"
 
 class MapleARRAY(MapleType):
-    def __init__(self, value : list):
-        super().__init__(value)
-        self.regname = "ARRAY"
+    __slots__ = ()
+
+    regname = "ARRAY"
+
+    # Arrays are charged to the memory budget whatever their size #
+    @staticmethod
+    def of(elements : list):
+        meter = BUDGET_METER.get()
+        if meter is not None:
+            meter.spend(ARRAY_BYTES + POINTER_BYTES * len(elements))
+        return MapleARRAY(elements)
 
     def op_getindex(self, index):
         if not isinstance(index, MapleINT):
@@ -329,5 +892,214 @@ class MapleARRAY(MapleType):
             report("TypeException", f"Index `{index.value}` out of range `{len(self.value) - 1}`.")
         return self.value[index.value]
 
+    def __repr__(self):
+        return spelled(self, repr, f"{self.regname}([", "])")
+
+    def op_represent(self) -> str:
+        return spelled(self, represent, "{ ", " }")
+
+# A tower of `height` powers of an INT `base`, as (base, height), past     #
+# TOWER_BITS bits. It is compared, reduced modulo an INT and measured from #
+# the logarithms of its levels; other operations compute the INT it       #
+# stands for first. Like every method, digits() and magnitude() apply to  #
+# a whole statement: `(2 *** 6).digits();` counts the digits of the tower  #
+# but `1 + (2 *** 6).digits();` reads as `(1 + 2 *** 6).digits();`.        #
+# INTs have both methods too.                                              #
+class MapleTOWER(MapleType):
+    __slots__ = ()
+
+    regname = "TOWER"
+    immutable = True
+
+    def __repr__(self):
+        return f"{self.regname}({self.value[0]} *** {self.value[1]})"
+
+    def op_mod(self, other):
+        return self.apply("op_mod", other, f"Expected the MOD operation modulus to be INT-type, got {other.regname}.")
+
+    def op_compare_eq(self, other):
+        kernel = KERNELS.get(("op_compare_eq", type(self), type(other)))
+        return kernel(self, other) if kernel else MapleBOOLEAN.of(False)
+
+    def op_compare_neq(self, other):
+        kernel = KERNELS.get(("op_compare_neq", type(self), type(other)))
+        return kernel(self, other) if kernel else MapleBOOLEAN.of(True)
+
+    def op_compare_gt(self, other):
+        return self.apply("op_compare_gt", other, f"{self.regname} and {other.regname} can't be compared together.")
+
+    def op_compare_gte(self, other):
+        return self.apply("op_compare_gte", other, f"{self.regname} and {other.regname} can't be compared together.")
+
+    def op_compare_lt(self, other):
+        return self.apply("op_compare_lt", other, f"{self.regname} and {other.regname} can't be compared together.")
+
+    def op_compare_lte(self, other):
+        return self.apply("op_compare_lte", other, f"{self.regname} and {other.regname} can't be compared together.")
+
+    def op_abs(self):
+        return self
+
+    def op_compare_not(self):
+        return self.materialized().op_compare_not()
+
+    # The INT this tower stands for, when it takes at most TOWER_MATERIAL_BITS bits #
+    def materialized(self) -> MapleINT:
+        result = tower_exponent(*self.value, TOWER_MATERIAL_BITS)
+        if result is None:
+            report("ArithmeticException", f"{self.op_represent()} is too big to be computed.")
+        return MapleINT.of(result)
+
+    # Scientific notation, under a "10^" for every level past a number of  #
+    # digits an INT could hold; from TOWER_LEVELS levels on they're counted #
+    # as "(10^)^n " instead, so the text stays short whatever the height.   #
     def op_represent(self) -> str:
-        return "{ " + ", ".join([n.op_represent() for n in self.value]) + " }"
\ No newline at end of file
+        k, x = tower_logs(*self.value, 10)
+        if k == 1 or x < 10 ** 15:
+            levels, top = k - 1, scientific(x)
+        else:
+            levels, top = k, f"{float(x):.6e}"
+        if levels < TOWER_LEVELS:
+            return "10^" * levels + top
+        return f"(10^)^{MapleINT.of(levels).op_represent()} {top}"
+
+    def method_digits(self, args : list[MapleType]):
+        if len(args) != 0:
+            report("ArgumentException", f"Expected 0 arguments, got {len(args)}.")
+        digits = tower_digits(*self.value)
+        if digits is None:
+            report("ArithmeticException", f"{self.op_represent()} has too many digits to be counted.")
+        return MapleINT.of(digits)
+
+    # Estimated logarithm in base 10, infinite past the FLOAT range #
+    def method_magnitude(self, args : list[MapleType]):
+        if len(args) != 0:
+            report("ArgumentException", f"Expected 0 arguments, got {len(args)}.")
+        k, x = tower_logs(*self.value, 10)
+        return MapleFLOAT(float(x) if k == 1 else math.inf)
+
+SMALL_INTS = [MapleINT(n) for n in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+FACTORIALS = [MapleINT.of(math.factorial(n)) for n in range(FACTORIAL_TABLE)]
+TRUE = MapleBOOLEAN(True)
+FALSE = MapleBOOLEAN(False)
+
+def int_kernel(function):
+    return lambda left, right: MapleINT.of(function(left.value, right.value))
+
+def float_kernel(function):
+    return lambda left, right: MapleFLOAT(function(left.value, right.value))
+
+def boolean_kernel(function):
+    return lambda left, right: MapleBOOLEAN.of(function(left.value, right.value))
+
+for _left in (MapleINT, MapleFLOAT):
+    for _right in (MapleINT, MapleFLOAT):
+        for _operation, _function in (("op_plus", operator.add), ("op_minus", operator.sub), ("op_mul", operator.mul), ("op_pow", float_power)):
+            if _left is _right is MapleINT:
+                register(_operation, _left, _right, MapleINT)(int_kernel(_function))
+            else:
+                register(_operation, _left, _right, MapleFLOAT)(float_kernel(_function))
+        register("op_div", _left, _right, MapleFLOAT)(float_kernel(operator.truediv))
+        register("op_mod", _left, _right, MapleINT)(int_kernel(operator.mod))
+
+    for _operation, _function in (("op_compare_eq", operator.eq), ("op_compare_neq", operator.ne), ("op_compare_gt", operator.gt),
+                                ("op_compare_gte", operator.ge), ("op_compare_lt", operator.lt), ("op_compare_lte", operator.le)):
+        register(_operation, MapleINT, _left, MapleBOOLEAN)(boolean_kernel(_function))
+
+# INT or TOWER #
+@register("op_tetr", MapleINT, MapleINT)
+def int_tetr(left, right):
+    base, height = left.value, right.value
+    if type(base) is type(height) is int and base >= 2:
+        result = tower_exponent(base, height, TOWER_BITS)
+        return MapleINT.of(result) if result is not None else MapleTOWER((base, height))
+    return MapleINT.of(tower(base, height, operator.pow))
+
+@register("op_tetr", MapleFLOAT, MapleINT, MapleFLOAT)
+def float_tetr(left, right):
+    return MapleFLOAT(tower(left.value, right.value, float_power))
+
+# Hand-written kernels for the hottest pairs #
+@register("op_plus", MapleINT, MapleINT, MapleINT)
+def int_plus(left, right):
+    return MapleINT.of(left.value + right.value)
+
+@register("op_minus", MapleINT, MapleINT, MapleINT)
+def int_minus(left, right):
+    return MapleINT.of(left.value - right.value)
+
+@register("op_mul", MapleINT, MapleINT, MapleINT)
+def int_mul(left, right):
+    bits = left.value.bit_length() + right.value.bit_length() if type(left.value) is type(right.value) is int else 0
+    if bits > BUDGET_FREE_BITS:
+        afford(bits)
+    return MapleINT.of(left.value * right.value)
+
+@register("op_pow", MapleINT, MapleINT, MapleINT)
+def int_pow(left, right):
+    bits = power_bits(left.value, right.value)
+    if bits > BUDGET_FREE_BITS:
+        afford(bits)
+    return MapleINT.of(left.value ** right.value)
+
+@register("op_plus", MapleSTRING, MapleSTRING, MapleSTRING)
+def string_plus(left, right):
+    bits = 8 * (len(left.value) + len(right.value))
+    if bits > BUDGET_FREE_BITS:
+        afford(bits, False)
+    return MapleSTRING(left.value + right.value)
+
+register("op_compare_eq", MapleSTRING, MapleSTRING, MapleBOOLEAN)(boolean_kernel(operator.eq))
+register("op_compare_neq", MapleSTRING, MapleSTRING, MapleBOOLEAN)(boolean_kernel(operator.ne))
+
+@register("op_compare_and", MapleBOOLEAN, MapleBOOLEAN, MapleBOOLEAN)
+def boolean_and(left, right):
+    return MapleBOOLEAN.of(left.value and right.value)
+
+@register("op_compare_or", MapleBOOLEAN, MapleBOOLEAN, MapleBOOLEAN)
+def boolean_or(left, right):
+    return MapleBOOLEAN.of(left.value or right.value)
+
+# Comparisons of towers with numbers and with each other, for either side #
+def compare_tower(function, left, right):
+    if type(left) is MapleTOWER:
+        sign = tower_compare(*left.value, right.value)
+    else:
+        sign = tower_compare(*right.value, left.value)
+        sign = -sign if sign is not None else None
+    if sign is None:
+        return MapleBOOLEAN.of(function is operator.ne)
+    return MapleBOOLEAN.of(function(sign, 0))
+
+def tower_kernel(function):
+    return lambda left, right: compare_tower(function, left, right)
+
+for _operation, _function in (("op_compare_eq", operator.eq), ("op_compare_neq", operator.ne), ("op_compare_gt", operator.gt),
+                            ("op_compare_gte", operator.ge), ("op_compare_lt", operator.lt), ("op_compare_lte", operator.le)):
+    for _other in (MapleINT, MapleFLOAT, MapleTOWER):
+        register(_operation, MapleTOWER, _other, MapleBOOLEAN)(tower_kernel(_function))
+    register(_operation, MapleINT, MapleTOWER, MapleBOOLEAN)(tower_kernel(_function))
+    register(_operation, MapleFLOAT, MapleTOWER, MapleBOOLEAN)(tower_kernel(_function))
+
+@register("op_mod", MapleTOWER, MapleINT, MapleINT)
+def tower_int_mod(left, right):
+    modulus = right.value
+    if modulus == 0:
+        raise ZeroDivisionError("integer modulo by zero")
+    result = tower_mod(*left.value, abs(modulus))
+    return MapleINT.of(result + modulus if result and modulus < 0 else result)
+
+# Operations towers don't implement work on the INTs they stand for #
+def materializing(operation : str):
+    def kernel(left, right):
+        if type(left) is MapleTOWER:
+            left = left.materialized()
+        if type(right) is MapleTOWER:
+            right = right.materialized()
+        return dispatch(operation, left, right)
+    return kernel
+
+for _operation in ("op_plus", "op_minus", "op_mul", "op_pow", "op_div", "op_mod", "op_tetr"):
+    for _left, _right in ((MapleTOWER, MapleINT), (MapleTOWER, MapleFLOAT), (MapleTOWER, MapleTOWER), (MapleINT, MapleTOWER), (MapleFLOAT, MapleTOWER)):
+        if (_operation, _left, _right) not in KERNELS:
+            register(_operation, _left, _right)(materializing(_operation))